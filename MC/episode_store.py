@@ -0,0 +1,160 @@
+import os
+import json
+import numpy as np
+
+# 저장소 디렉터리 안의 파일 이름
+META_FILE = 'meta.json'
+OFFSETS_FILE = 'offsets.bin'
+
+# 점프 게임 에피소드 열 (이름: dtype)
+JUMP_GAME_COLUMNS = {'position': 'int32', 'energy': 'int32', 'action': 'int8', 'reward': 'float64'}
+
+# GridWorld 전이 열 (상태는 정수 인덱스, MDP/train.py의 train_agent(recorder=...)와 replay_episodes에서 사용)
+GRID_WORLD_COLUMNS = {'state': 'int64', 'action': 'int8', 'reward': 'float64', 'next_state': 'int64', 'done': 'bool'}
+
+def _column_path(directory, name):
+    return os.path.join(directory, f"{name}.bin")
+
+class EpisodeRecorder:
+    """
+    에피소드를 열 단위 바이너리 파일로 추가 기록
+    열마다 <이름>.bin에 모든 스텝을 이어 붙이고, offsets.bin에는 에피소드별 끝 위치(누적 스텝 수)를 기록한다.
+    chunk_size 스텝이 쌓일 때마다 파일에 쓰며, meta.json을 마지막에 교체하므로
+    meta.json에 적힌 에피소드까지가 항상 완전한 기록이다.
+    이미 저장소가 있으면 meta.json 이후의 불완전한 기록을 잘라 내고 이어서 기록한다.
+    """
+    def __init__(self, directory, columns=JUMP_GAME_COLUMNS, chunk_size=65536):
+        self.directory = directory
+        self.columns = {name: np.dtype(dtype) for name, dtype in columns.items()}
+        self.chunk_size = chunk_size
+        os.makedirs(directory, exist_ok=True)
+
+        self.num_episodes = 0
+        self.num_steps = 0
+        meta_path = os.path.join(directory, META_FILE)
+        if os.path.exists(meta_path):
+            with open(meta_path) as f:
+                meta = json.load(f)
+            if meta['columns'] != {name: dtype.str for name, dtype in self.columns.items()}:
+                raise ValueError(f"저장소의 열 {meta['columns']}이 기록할 열과 다릅니다.")
+            self.num_episodes = meta['num_episodes']
+            self.num_steps = meta['num_steps']
+
+        # meta.json에 반영되지 않은 꼬리 기록 정리
+        for name, dtype in self.columns.items():
+            self._truncate(_column_path(directory, name), self.num_steps * dtype.itemsize)
+        self._truncate(os.path.join(directory, OFFSETS_FILE), self.num_episodes * 8)
+
+        self.buffers = {name: [] for name in self.columns}
+        self.offset_buffer = []
+        self.buffered_steps = 0
+
+    @staticmethod
+    def _truncate(path, size):
+        with open(path, 'ab') as f:
+            f.truncate(size)
+
+    def add_episode(self, **columns):
+        """에피소드 하나 추가 (열 이름별 1차원 배열, 길이가 모두 같아야 함)"""
+        lengths = {len(columns[name]) for name in self.columns}
+        if len(lengths) != 1:
+            raise ValueError("에피소드의 열 길이가 서로 다릅니다.")
+        for name in self.columns:
+            self.buffers[name].append(np.asarray(columns[name], dtype=self.columns[name]))
+        self._add_lengths([lengths.pop()])
+
+    def add_batch(self, lengths, **columns):
+        """
+        (스텝 수 x 에피소드 수)로 채워진 배치 에피소드 추가 (MonteCarloPredictor.generate_episodes 형식)
+        에피소드 e는 각 열의 [:lengths[e], e] 구간이다.
+        """
+        lengths = np.asarray(lengths)
+        num_steps = next(iter(columns.values())).shape[0]
+        valid = (np.arange(num_steps)[:, None] < lengths).T
+        for name in self.columns:
+            self.buffers[name].append(np.asarray(columns[name]).T[valid].astype(self.columns[name]))
+        self._add_lengths(lengths)
+
+    def _add_lengths(self, lengths):
+        ends = self.num_steps + self.buffered_steps + np.cumsum(lengths, dtype=np.int64)
+        self.offset_buffer.append(ends)
+        self.buffered_steps += int(np.sum(lengths))
+        if self.buffered_steps >= self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        """버퍼에 쌓인 스텝을 파일에 쓰고 meta.json 갱신"""
+        if not self.offset_buffer:
+            return
+        for name in self.columns:
+            with open(_column_path(self.directory, name), 'ab') as f:
+                np.concatenate(self.buffers[name]).tofile(f)
+            self.buffers[name] = []
+        offsets = np.concatenate(self.offset_buffer)
+        with open(os.path.join(self.directory, OFFSETS_FILE), 'ab') as f:
+            offsets.tofile(f)
+
+        self.num_episodes += len(offsets)
+        self.num_steps += self.buffered_steps
+        self.offset_buffer = []
+        self.buffered_steps = 0
+
+        meta = {
+            'columns': {name: dtype.str for name, dtype in self.columns.items()},
+            'num_episodes': self.num_episodes,
+            'num_steps': self.num_steps,
+        }
+        meta_path = os.path.join(self.directory, META_FILE)
+        with open(meta_path + '.tmp', 'w') as f:
+            json.dump(meta, f)
+        os.replace(meta_path + '.tmp', meta_path)
+
+    def close(self):
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+class EpisodeReader:
+    """
+    EpisodeRecorder 저장소를 메모리 맵으로 읽기
+    iter_chunks는 에피소드 묶음 단위로 필요한 구간만 읽어 오므로 전체를 메모리에 올리지 않는다.
+    """
+    def __init__(self, directory):
+        with open(os.path.join(directory, META_FILE)) as f:
+            meta = json.load(f)
+        self.directory = directory
+        self.num_episodes = meta['num_episodes']
+        self.num_steps = meta['num_steps']
+        self.offsets = self._open(os.path.join(directory, OFFSETS_FILE), np.int64, self.num_episodes)
+        self.columns = {
+            name: self._open(_column_path(directory, name), np.dtype(dtype), self.num_steps)
+            for name, dtype in meta['columns'].items()
+        }
+
+    @staticmethod
+    def _open(path, dtype, length):
+        # 빈 파일은 메모리 맵할 수 없으므로 빈 배열 사용
+        if length == 0:
+            return np.zeros(0, dtype=dtype)
+        return np.memmap(path, dtype=dtype, mode='r', shape=(length,))
+
+    def __len__(self):
+        return self.num_episodes
+
+    def episode(self, index):
+        """에피소드 하나의 열 딕셔너리"""
+        start = self.offsets[index - 1] if index > 0 else 0
+        end = self.offsets[index]
+        return {name: np.asarray(column[start:end]) for name, column in self.columns.items()}
+
+    def iter_chunks(self, chunk_episodes=10000):
+        """(열 딕셔너리 (이어 붙인 스텝), 에피소드 길이 배열)을 chunk_episodes개 에피소드씩 생성"""
+        for first in range(0, self.num_episodes, chunk_episodes):
+            ends = np.asarray(self.offsets[first:first + chunk_episodes])
+            start = self.offsets[first - 1] if first > 0 else 0
+            lengths = np.diff(ends, prepend=start)
+            yield {name: np.asarray(column[start:ends[-1]]) for name, column in self.columns.items()}, lengths
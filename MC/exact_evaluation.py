@@ -0,0 +1,138 @@
+import time
+import numpy as np
+import matplotlib.pyplot as plt
+from jump_game_env import JumpGameEnv, BatchJumpGameEnv
+from policies import RandomPolicy, BetterPolicy
+from monte_carlo_prediction import MonteCarloPredictor
+
+def build_model(env, policy):
+    """
+    정책을 따르는 JumpGameEnv의 전이 모델 생성 (상태 순서는 env.get_state_index의 상태 인덱스)
+    모든 (상태, 행동)을 BatchJumpGameEnv로 한 스텝씩 진행해 얻으며, 종료 전이는 가치 0인 흡수 상태로 본다.
+    반환값: (상태 전이 행렬 P[s, s'], 기대 보상 r[s])
+    """
+    num_states = env.num_states
+    positions, energies = env.get_state_from_index(np.arange(num_states))
+
+    # 각 상태에서 걷기(0)와 점프(1)를 한 번씩 실행
+    batch_env = BatchJumpGameEnv.from_env(env, 2 * num_states)
+    batch_env.reset()
+    batch_env.positions = np.repeat(positions, 2)
+    batch_env.energies = np.repeat(energies, 2)
+    actions = np.tile([0, 1], num_states)
+    (next_positions, next_energies), rewards, dones = batch_env.step(actions)
+
+    action_probs = policy.action_probabilities((positions, energies)).reshape(-1)
+    sources = np.repeat(np.arange(num_states), 2)
+    r = np.bincount(sources, weights=action_probs * rewards, minlength=num_states)
+    P = np.zeros((num_states, num_states))
+    targets = env.get_state_index((next_positions, next_energies))
+    np.add.at(P, (sources[~dones], targets[~dones]), action_probs[~dones])
+    return P, r
+
+def evaluate_policy_exact(env, policy, gamma=0.9):
+    """선형 방정식 (I - γP)V = r을 풀어 정책의 상태 가치 계산 (상태 순서 배열)"""
+    P, r = build_model(env, policy)
+    return np.linalg.solve(np.eye(len(r)) - gamma * P, r)
+
+def evaluate_policy_iterative(env, policy, gamma=0.9, theta=1e-12, max_iterations=10000):
+    """
+    반복 정책 평가 V <- r + γPV (최대 변화량이 theta 미만이면 종료)
+    반환값: (상태 순서 가치 배열, 반복 횟수)
+    """
+    P, r = build_model(env, policy)
+    V = np.zeros(len(r))
+    for iteration in range(1, max_iterations + 1):
+        new_V = r + gamma * P @ V
+        delta = np.max(np.abs(new_V - V))
+        V = new_V
+        if delta < theta:
+            break
+    return V, iteration
+
+def reachable_states(env, policy):
+    """시작 상태에서 정책을 따라 방문 확률이 0보다 큰 상태 마스크 (RMSE 계산 대상)"""
+    P, _ = build_model(env, policy)
+    visits = np.zeros(env.num_states)
+    visits[env.get_state_index(env.reset())] = 1.0
+    # 기대 방문 횟수 (I - P^T)^-1 e_start
+    return np.linalg.solve(np.eye(env.num_states) - P.T, visits) > 0
+
+def mc_rmse_curve(env, policy, true_values, mask, num_episodes, gamma=0.9, seed=0, num_points=30):
+    """
+    배치 몬테카를로 예측의 RMSE를 에피소드 수와 CPU 시간에 따라 기록
+    측정 지점은 로그 간격이며, RMSE는 mask의 상태만으로 계산한다.
+    반환값: (에피소드 수 배열, CPU 초 배열, RMSE 배열)
+    """
+    predictor = MonteCarloPredictor(env, gamma=gamma)
+    rng = np.random.default_rng(seed)
+    checkpoints = np.unique(np.geomspace(10, num_episodes, num_points).astype(np.int64))
+
+    episodes, seconds, errors = [], [], []
+    done = 0
+    elapsed = 0.0
+    for checkpoint in checkpoints:
+        start = time.process_time()
+        predictor.update_batch(*predictor.generate_episodes(policy, checkpoint - done, rng))
+        elapsed += time.process_time() - start
+        done = checkpoint
+
+        episodes.append(done)
+        seconds.append(elapsed)
+        errors.append(np.sqrt(np.mean((predictor.values[mask] - true_values[mask]) ** 2)))
+    return np.array(episodes), np.array(seconds), np.array(errors)
+
+def plot_rmse(curves):
+    """정책별 MC RMSE를 에피소드 수와 CPU 시간 기준으로 시각화"""
+    fig, axes = plt.subplots(1, 2, figsize=(14, 5))
+    for name, (episodes, seconds, errors) in curves.items():
+        axes[0].loglog(episodes, errors, marker='o', label=name)
+        axes[1].loglog(seconds, errors, marker='o', label=name)
+
+    axes[0].set_xlabel("Episodes")
+    axes[1].set_xlabel("CPU seconds")
+    for ax in axes:
+        ax.set_ylabel("RMSE vs exact V(s)")
+        ax.grid(True, which='both', alpha=0.3)
+        ax.legend()
+    fig.suptitle("Monte Carlo Prediction Error")
+    fig.tight_layout()
+    return fig
+
+def main():
+    env = JumpGameEnv()
+    gamma = 0.9
+    num_episodes = 200000
+    policies = {'random_policy': RandomPolicy(env), 'better_policy': BetterPolicy(env)}
+
+    print("=== 점프 게임 정확한 정책 평가 ===")
+    curves = {}
+    for name, policy in policies.items():
+        exact = evaluate_policy_exact(env, policy, gamma)
+        iterative, iterations = evaluate_policy_iterative(env, policy, gamma)
+        mask = reachable_states(env, policy)
+        start_index = env.get_state_index(env.reset())
+        print(f"[{name}] V(시작) = {exact[start_index]:.6f}, 반복 평가 {iterations}회 "
+              f"(선형 풀이와 최대 차이 {np.max(np.abs(exact - iterative)):.2e}), 도달 가능 상태 {mask.sum()}개")
+
+        curves[name] = mc_rmse_curve(env, policy, exact, mask, num_episodes, gamma)
+        for episodes, seconds, error in list(zip(*curves[name]))[::6]:
+            print(f"  에피소드 {episodes:>6}: RMSE {error:.4f} ({seconds:.3f} CPU 초)")
+
+    plot_rmse(curves).savefig("mc_rmse.png")
+
+    # 오프 폴리시 평가: random_policy 에피소드 한 벌로 두 정책을 함께 평가
+    num_off_policy_episodes = 20000
+    print(f"\n=== 오프 폴리시 평가 (행동 정책 random_policy, 에피소드 {num_off_policy_episodes}개) ===")
+    predictor = MonteCarloPredictor(env, gamma=gamma)
+    for weighted in (False, True):
+        estimates, _ = predictor.predict_off_policy(num_off_policy_episodes, policies['random_policy'], policies,
+                                                    weighted=weighted, rng=np.random.default_rng(0))
+        for name, policy in policies.items():
+            exact = evaluate_policy_exact(env, policy, gamma)
+            mask = reachable_states(env, policy)
+            errors = estimates[name][mask] - exact[mask]
+            print(f"{'가중' if weighted else '일반'} 중요도 샘플링 [{name}]: RMSE {np.sqrt(np.mean(np.square(errors))):.4f}")
+
+if __name__ == "__main__":
+    main()
@@ -4,24 +4,33 @@ class JumpGameEnv:
     """
     간단한 점프 게임 환경
     
-    상태: 0부터 10까지의 위치 (0: 시작, 10: 목표)
+    상태: 0부터 board_size까지의 위치 (0: 시작, board_size: 목표)와 에너지 0~max_energy
     행동: 0 (걷기), 1 (점프)
     
     규칙:
     - 걷기: 1칸 전진, 장애물이 있으면 제자리
     - 점프: 2칸 전진, 에너지 1 소모
-    - 장애물 위치: 3, 6, 8
-    - 시작 시 에너지: 3
-    - 목표(10)에 도달하거나 더 이상 움직일 수 없으면 종료
+    - 장애물 위치: 기본 3, 6, 8
+    - 시작 시 에너지: max_energy (기본 3)
+    - 목표(board_size)에 도달하거나 더 이상 움직일 수 없으면 종료
+    
+    상태 (위치, 에너지)는 get_state_index로 위치 * (max_energy + 1) + 에너지의 정수 인덱스로 바뀐다.
     """
     
-    def __init__(self):
-        # 게임판 크기 (0부터 9까지)
-        self.board_size = 10
+    def __init__(self, board_size=10, obstacles=(3, 6, 8), max_energy=3):
+        # 게임판 크기 (0부터 board_size - 1까지)
+        self.board_size = board_size
         # 장애물 위치
-        self.obstacles = [3, 6, 8]
+        self.obstacles = sorted(obstacles)
+        if any(not 0 < obs < board_size for obs in self.obstacles):
+            raise ValueError(f"장애물 위치는 1 이상 {board_size - 1} 이하여야 합니다: {self.obstacles}")
+        self.obstacle_set = set(self.obstacles)
         # 목표 위치
-        self.goal = 10
+        self.goal = board_size
+        # 시작 에너지 (에너지 최대값)
+        self.max_energy = max_energy
+        # 상태 수 (목표 이전 위치 x 에너지 0~max_energy)
+        self.num_states = board_size * (max_energy + 1)
         # 에이전트 초기 위치와 에너지
         self.reset()
     
@@ -29,7 +38,7 @@ class JumpGameEnv:
         # 에이전트 위치 초기화
         self.position = 0
         # 에너지 초기화
-        self.energy = 3
+        self.energy = self.max_energy
         # 종료 여부
         self.done = False
         # 현재 상태 반환
@@ -45,7 +54,7 @@ class JumpGameEnv:
         
         # 행동에 따른 상태 변화
         if action == 0:  # 걷기
-            if self.position + 1 in self.obstacles:
+            if self.position + 1 in self.obstacle_set:
                 # 장애물이 있으면 제자리
                 pass
             else:
@@ -57,7 +66,7 @@ class JumpGameEnv:
                 target_pos = self.position + 2
                 
                 # 목표가 장애물인 경우, 장애물 바로 앞에 머무름
-                if target_pos in self.obstacles:
+                if target_pos in self.obstacle_set:
                     self.position = target_pos - 1  # 장애물 바로 앞에 위치
                 else:
                     self.position = target_pos  # 일반적인 점프
@@ -84,7 +93,7 @@ class JumpGameEnv:
         # 더 이상 움직일 수 없는 경우 게임 종료 (약간의 페널티)
         if not self.done:
             stuck = False
-            if self.position + 1 in self.obstacles and (self.energy == 0 or self.position + 2 >= self.board_size):
+            if self.position + 1 in self.obstacle_set and (self.energy == 0 or self.position + 2 >= self.board_size):
                 stuck = True
             
             if stuck:
@@ -98,25 +107,90 @@ class JumpGameEnv:
         return (self.position, self.energy)
     
     def get_all_states(self):
-        # 가능한 모든 상태 조합
-        states = []
-        for pos in range(self.board_size):
-            for energy in range(4):
-                # 목표 도달 후의 에너지는 중요하지 않음
-                if pos == self.goal:
-                    states.append((pos, 0))
-                    break
-                else:
-                    states.append((pos, energy))
-        return states
+        # 가능한 모든 상태 조합 (상태 인덱스 순서)
+        return [(pos, energy) for pos in range(self.board_size) for energy in range(self.max_energy + 1)]
+    
+    def get_state_index(self, state):
+        """상태 (위치, 에너지)를 정수 인덱스로 변환 (위치/에너지 배열이면 인덱스 배열)"""
+        position, energy = state
+        return position * (self.max_energy + 1) + energy
+    
+    def get_state_from_index(self, index):
+        """정수 인덱스(배열)를 상태 (위치, 에너지)로 변환"""
+        return divmod(index, self.max_energy + 1)
+    
+    def to_grid(self, array):
+        """상태 인덱스 순서의 배열을 (에너지, 위치) 2차원 배열로 변환 (히트맵용)"""
+        return np.asarray(array).reshape(self.board_size, self.max_energy + 1).T
 
     def render(self):
         # 현재 게임 상태를 텍스트로 출력
-        board = ['-'] * self.board_size
-        for obs in self.obstacles:
+        board = ['-'] * (self.board_size + 1)
+        for obs in self.obstacle_set:
             board[obs] = 'X'
         board[self.goal] = 'G'
         board[self.position] = 'P'
         
         print(''.join(board))
-        print(f"위치: {self.position}, 에너지: {self.energy}")
\ No newline at end of file
+        print(f"위치: {self.position}, 에너지: {self.energy}")
+
+class BatchJumpGameEnv(JumpGameEnv):
+    """
+    여러 에피소드를 한꺼번에 진행하는 점프 게임 환경
+    (위치, 에너지)를 배열로 두고 걷기, 점프, 장애물, 갇힘 판정을 NumPy 마스크로 계산한다.
+    규칙은 JumpGameEnv.step과 같으며, 종료된 에피소드는 제자리에서 보상 0을 받는다.
+    """
+    
+    def __init__(self, num_envs, **kwargs):
+        self.num_envs = num_envs
+        super().__init__(**kwargs)
+        # 위치별 장애물 여부 (점프 목표 위치까지 포함)
+        self.obstacle_mask = np.zeros(self.goal + 3, dtype=bool)
+        self.obstacle_mask[self.obstacles] = True
+    
+    @classmethod
+    def from_env(cls, env, num_envs):
+        """단일 환경과 같은 설정의 배치 환경 생성"""
+        return cls(num_envs, board_size=env.board_size, obstacles=env.obstacles, max_energy=env.max_energy)
+    
+    def reset(self):
+        # 단일 환경의 초기 상태를 모든 에피소드에 복사
+        position, energy = super().reset()
+        self.positions = np.full(self.num_envs, position, dtype=np.int64)
+        self.energies = np.full(self.num_envs, energy, dtype=np.int64)
+        self.dones = np.zeros(self.num_envs, dtype=bool)
+        return self._get_states()
+    
+    def step(self, actions):
+        active = ~self.dones
+        prev_positions = self.positions.copy()
+        
+        # 걷기: 장애물이 없으면 한 칸 전진
+        walk = active & (actions == 0) & ~self.obstacle_mask[prev_positions + 1]
+        # 점프: 에너지가 있으면 2칸 전진 (목표가 장애물이면 바로 앞에 머무름)
+        jump = active & (actions == 1) & (self.energies > 0)
+        targets = prev_positions + 2
+        targets -= self.obstacle_mask[targets]
+        
+        self.positions = np.where(walk, prev_positions + 1, np.where(jump, targets, prev_positions))
+        self.energies -= jump
+        
+        # 전진한 거리에 비례한 보상
+        rewards = 0.2 * (self.positions - prev_positions)
+        
+        # 목표 도달
+        reached = active & (self.positions >= self.goal)
+        rewards[reached] = 10
+        self.positions[reached] = self.goal
+        
+        # 더 이상 움직일 수 없는 경우 (장애물 앞, 에너지 없음 또는 점프할 공간 없음)
+        stuck = (active & ~reached & self.obstacle_mask[self.positions + 1]
+                 & ((self.energies == 0) | (self.positions + 2 >= self.board_size)))
+        rewards[stuck] = -1
+        
+        self.dones = self.dones | reached | stuck
+        return self._get_states(), rewards, self.dones.copy()
+    
+    def _get_states(self):
+        # 상태는 (위치 배열, 에너지 배열)
+        return (self.positions.copy(), self.energies.copy())
@@ -1,23 +1,103 @@
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
 import numpy as np
-from collections import defaultdict
+from jump_game_env import BatchJumpGameEnv
+
+class ValueHistory:
+    """
+    가치 함수 스냅샷 기록
+    (스냅샷 수, 상태 수) 크기의 2차원 배열을 미리 할당하며, 열 순서는 env.get_state_index의 상태 인덱스를 따른다.
+    배열 크기가 memory_budget(바이트)을 넘으면 np.memmap 파일(spill_path, 없으면 임시 파일)에 기록한다.
+    직접 만든 임시 파일은 close()나 객체가 사라질 때 지우고, spill_path로 받은 파일은 호출자 소유로 남겨 둔다.
+    """
+    def __init__(self, env, capacity, memory_budget=None, spill_path=None):
+        self.env = env
+        self.episodes = np.zeros(capacity, dtype=np.int64)
+        self.size = 0
+        self.temp_path = None  # 직접 만든 임시 spill 파일
+        
+        shape = (capacity, env.num_states)
+        if memory_budget is not None and np.prod(shape) * 8 > memory_budget:
+            if spill_path is None:
+                fd, spill_path = tempfile.mkstemp(suffix='.dat')
+                os.close(fd)
+                self.temp_path = spill_path
+            self.values = np.memmap(spill_path, dtype=np.float64, mode='w+', shape=shape)
+        else:
+            self.values = np.zeros(shape)
+    
+    def close(self):
+        """직접 만든 임시 spill 파일 삭제 (이후 기록은 비어 있음)"""
+        if self.temp_path is not None:
+            self.values = np.zeros((0, self.env.num_states))
+            self.episodes = self.episodes[:0]
+            self.size = 0
+            os.remove(self.temp_path)
+            self.temp_path = None
+    
+    def __del__(self):
+        if getattr(self, 'temp_path', None) is not None:
+            self.close()
+    
+    def __len__(self):
+        return self.size
+    
+    def append(self, episode, values):
+        """에피소드 번호와 상태 순서의 가치 배열 한 행 기록"""
+        self.episodes[self.size] = episode
+        self.values[self.size] = values
+        self.size += 1
+    
+    def get(self, state):
+        """한 상태의 가치 변화 (스냅샷 순서)"""
+        return self.values[:self.size, self.env.get_state_index(state)]
+
+def _predict_worker(env, policy, gamma, num_episodes, seed_seq, batch_size):
+    """워커: 자신의 난수 생성기로 에피소드를 생성하고 상태별 통계량만 반환"""
+    predictor = MonteCarloPredictor(env, gamma=gamma)
+    if num_episodes > 0:
+        predictor.predict_batch(num_episodes, policy, batch_size=batch_size, rng=np.random.default_rng(seed_seq))
+    return predictor.get_statistics()
+
+def _pad_episodes(values, lengths):
+    """이어 붙인 스텝 배열을 (스텝 수 x 에피소드 수) 배열로 변환 (에피소드 끝 이후는 0)"""
+    num_steps = int(lengths.max()) if len(lengths) else 0
+    valid = (np.arange(num_steps)[:, None] < lengths).T
+    padded = np.zeros((len(lengths), num_steps), dtype=values.dtype)
+    padded[valid] = values
+    return padded.T
 
 class MonteCarloPredictor:
     """
     몬테카를로 예측 알고리즘 구현
+    
+    반환값 목록을 저장하지 않고 상태별 충분 통계량(방문 횟수, 평균, 웰포드 제곱편차합)만
+    갱신하므로 에피소드 수와 무관하게 메모리가 일정하다.
+    가치 함수와 통계량은 env.get_state_index의 정수 상태 인덱스로 접근하는 NumPy 배열이다.
+    step_size를 주면 가치 함수는 고정 스텝 크기 갱신 V += α(G - V)를 사용한다.
+    가치 함수 스냅샷은 history_interval 에피소드마다 ValueHistory 배열에 기록된다.
     """
-    def __init__(self, env, gamma=0.9):
+    def __init__(self, env, gamma=0.9, step_size=None, history_interval=10,
+                 history_memory_budget=None, history_path=None):
         self.env = env
         self.gamma = gamma  # 할인율
+        self.step_size = step_size  # 고정 스텝 크기 (None이면 표본 평균)
+        self.history_interval = history_interval  # 스냅샷 간격 (에피소드)
+        self.history_memory_budget = history_memory_budget  # 스냅샷 배열 메모리 예산 (바이트)
+        self.history_path = history_path  # 예산 초과 시 사용할 memmap 파일 경로
+        self.num_states = env.num_states
         self.reset()
     
     def reset(self):
         # 가치 함수 및 방문 횟수 초기화
-        self.values = defaultdict(float)  # 상태 가치 함수
-        self.returns = defaultdict(list)  # 각 상태의 반환값 목록
-        self.visit_counts = defaultdict(int)  # 상태 방문 횟수
+        self.values = np.zeros(self.num_states)  # 상태 가치 함수
+        self.visit_counts = np.zeros(self.num_states, dtype=np.int64)  # 상태 방문 횟수
+        self.mean_returns = np.zeros(self.num_states)  # 반환값의 표본 평균
+        self.m2 = np.zeros(self.num_states)  # 반환값 편차 제곱합 (웰포드)
         
-        # 각 에피소드의 가치 함수 변화 추적
-        self.value_history = []
+        # 각 에피소드의 가치 함수 변화 추적 (predict에서 에피소드 수에 맞춰 할당)
+        self.value_history = ValueHistory(self.env, 0)
     
     def generate_episode(self, policy):
         """무작위 정책을 따라 에피소드 생성"""
@@ -33,9 +113,227 @@ class MonteCarloPredictor:
         
         return episode
     
+    def generate_episodes(self, policy, num_episodes, rng=np.random):
+        """
+        BatchJumpGameEnv로 에피소드 num_episodes개를 한꺼번에 생성
+        policy는 상태 배열을 받아 행동 배열을 반환해야 한다 (policies.StochasticPolicy).
+        반환값: (위치, 에너지, 행동, 보상) 배열 (스텝 수 x 에피소드 수)과 에피소드 길이
+        """
+        batch_env = BatchJumpGameEnv.from_env(self.env, num_episodes)
+        state = batch_env.reset()
+        lengths = np.zeros(num_episodes, dtype=np.int64)
+        positions, energies, actions, rewards = [], [], [], []
+        done = np.zeros(num_episodes, dtype=bool)
+        
+        while not done.all():
+            action = policy(state, rng)
+            lengths += ~done
+            positions.append(state[0])
+            energies.append(state[1])
+            actions.append(action)
+            state, reward, done = batch_env.step(action)
+            rewards.append(reward)
+        
+        return (np.array(positions), np.array(energies), np.array(actions),
+                np.array(rewards, dtype=np.float64), lengths)
+    
+    def predict_batch(self, num_episodes, policy, batch_size=1000, rng=np.random, recorder=None):
+        """
+        배치 환경으로 에피소드를 batch_size개씩 생성하는 몬테카를로 예측
+        첫 방문 반환값의 통계량을 배치 단위로 모아 기존 통계량에 병합하며,
+        가치 함수 스냅샷은 history_interval의 배수 번째 에피소드를 포함한 배치(와 마지막 배치)가 끝날 때
+        그 배치의 마지막 에피소드 번호로 기록된다 (batch_size=1이면 predict와 같은 시점).
+        recorder(episode_store.EpisodeRecorder)를 주면 생성한 에피소드를 함께 저장한다.
+        """
+        self.reset()
+        self.value_history = self._make_history(num_episodes, -(-num_episodes // batch_size))
+        
+        for first in range(0, num_episodes, batch_size):
+            count = min(batch_size, num_episodes - first)
+            positions, energies, actions, rewards, lengths = self.generate_episodes(policy, count, rng)
+            if recorder is not None:
+                recorder.add_batch(lengths, position=positions, energy=energies, action=actions, reward=rewards)
+            self.update_batch(positions, energies, actions, rewards, lengths)
+            if self._history_due(first, first + count, num_episodes):
+                self.record_history(first + count - 1)
+        
+        return self.values, self.value_history, self.visit_counts
+    
+    def predict_from_store(self, reader, first_visit=True, chunk_episodes=10000):
+        """
+        디스크에 저장된 에피소드(episode_store.EpisodeReader)를 묶음 단위로 읽어 몬테카를로 예측
+        같은 에피소드로 gamma나 첫 방문/모든 방문 설정만 바꿔 다시 추정할 수 있다.
+        가치 함수 스냅샷은 predict_batch와 같이 history_interval의 배수 번째 에피소드를 포함한 묶음
+        (와 마지막 묶음)이 끝날 때 기록된다.
+        """
+        self.reset()
+        self.value_history = self._make_history(len(reader), -(-len(reader) // chunk_episodes))
+        
+        done = 0
+        for columns, lengths in reader.iter_chunks(chunk_episodes):
+            padded = {name: _pad_episodes(columns[name], lengths) for name in ('position', 'energy', 'action', 'reward')}
+            self.update_batch(padded['position'], padded['energy'], padded['action'], padded['reward'], lengths,
+                              first_visit=first_visit)
+            if self._history_due(done, done + len(lengths), len(reader)):
+                self.record_history(done + len(lengths) - 1)
+            done += len(lengths)
+        
+        return self.values, self.value_history, self.visit_counts
+    
+    def update_batch(self, positions, energies, actions, rewards, lengths, first_visit=True):
+        """generate_episodes 형식 에피소드 배치의 반환값(기본: 첫 방문)으로 통계량 갱신"""
+        state_ids, returns, _ = self.episode_returns(positions, energies, rewards, lengths, first_visit=first_visit)
+        self.merge_returns(state_ids, returns)
+    
+    def episode_returns(self, positions, energies, rewards, lengths, ratios=None, first_visit=True):
+        """
+        에피소드 배치 (스텝 수 x 에피소드 수)에서 방문별 반환값 추출
+        first_visit=True면 에피소드마다 각 상태의 첫 방문만, False면 모든 방문을 사용한다.
+        ratios(스텝별 중요도 비율)를 주면 그 시점부터 에피소드 끝까지의 누적 중요도 가중치도 계산한다.
+        반환값: (상태 인덱스, 반환값, 중요도 가중치 또는 None) 1차원 배열
+        """
+        num_steps, num_episodes = rewards.shape
+        valid = np.arange(num_steps)[:, None] < lengths
+        
+        # 뒤에서부터 반환값과 중요도 가중치 계산
+        returns = np.zeros_like(rewards)
+        weights = np.ones_like(rewards)
+        G = np.zeros(num_episodes)
+        W = np.ones(num_episodes)
+        for t in range(num_steps - 1, -1, -1):
+            G = np.where(valid[t], self.gamma * G + rewards[t], 0.0)
+            returns[t] = G
+            if ratios is not None:
+                W = np.where(valid[t], ratios[t] * W, 1.0)
+                weights[t] = W
+        
+        # 에피소드별 각 상태의 첫 방문만 선택 (에피소드, 시간 순으로 펼쳐 첫 등장 위치 사용)
+        state_ids = self.env.get_state_index((positions.T[valid.T], energies.T[valid.T]))
+        if first_visit:
+            episode_ids = np.nonzero(valid.T)[0]
+            _, first = np.unique(episode_ids * self.num_states + state_ids, return_index=True)
+        else:
+            first = np.arange(len(state_ids))
+        return (state_ids[first], returns.T[valid.T][first],
+                None if ratios is None else weights.T[valid.T][first])
+    
+    def predict_off_policy(self, num_episodes, behavior_policy, target_policies, weighted=True,
+                           batch_size=1000, rng=np.random):
+        """
+        행동 정책의 에피소드 한 벌로 여러 목표 정책의 가치를 평가하는 오프 폴리시 몬테카를로 예측
+        behavior_policy와 target_policies({이름: 정책})는 action_probabilities를 제공해야 한다.
+        
+        weighted=True면 가중 중요도 샘플링: C(s) += W, V(s) += W / C(s) * (G - V(s))
+        weighted=False면 일반 중요도 샘플링: N(s) += 1, V(s) += (W * G - V(s)) / N(s)
+        (배치 안의 갱신은 같은 결과를 내는 합으로 한꺼번에 적용)
+        반환값: ({이름: 가치 함수 배열}, {이름: 누적 가중치(또는 방문 횟수) 배열}) (상태 인덱스 순서)
+        """
+        num_states = self.num_states
+        values = {name: np.zeros(num_states) for name in target_policies}
+        cumulative = {name: np.zeros(num_states) for name in target_policies}
+        
+        for first in range(0, num_episodes, batch_size):
+            count = min(batch_size, num_episodes - first)
+            positions, energies, actions, rewards, lengths = self.generate_episodes(behavior_policy, count, rng)
+            behavior_probs = np.take_along_axis(
+                behavior_policy.action_probabilities((positions, energies)), actions[..., None], axis=-1)[..., 0]
+            
+            for name, target_policy in target_policies.items():
+                target_probs = np.take_along_axis(
+                    target_policy.action_probabilities((positions, energies)), actions[..., None], axis=-1)[..., 0]
+                state_ids, returns, weights = self.episode_returns(
+                    positions, energies, rewards, lengths, ratios=target_probs / behavior_probs)
+                
+                # 점증적 갱신을 배치 합으로: V_new = (C V + Σ W G) / (C + Σ W)  (일반 IS는 W 대신 1)
+                weighted_returns = np.bincount(state_ids, weights=weights * returns, minlength=num_states)
+                increments = (np.bincount(state_ids, weights=weights, minlength=num_states) if weighted
+                              else np.bincount(state_ids, minlength=num_states).astype(np.float64))
+                total = cumulative[name] + increments
+                values[name] = np.divide(cumulative[name] * values[name] + weighted_returns, total,
+                                         out=values[name], where=total > 0)
+                cumulative[name] = total
+        
+        return values, cumulative
+    
+    def merge_returns(self, state_ids, returns):
+        """
+        상태 인덱스별 반환값 묶음의 통계량을 기존 통계량에 병합
+        고정 스텝 크기면 반환값을 주어진 순서대로 하나씩 갱신한 것과 같은 결과를 닫힌 식으로 계산한다.
+        """
+        num_states = self.num_states
+        counts = np.bincount(state_ids, minlength=num_states)
+        sums = np.bincount(state_ids, weights=returns, minlength=num_states)
+        means = np.divide(sums, counts, out=np.zeros(num_states), where=counts > 0)
+        m2s = np.bincount(state_ids, weights=(returns - means[state_ids]) ** 2, minlength=num_states)
+        
+        if self.step_size is not None:
+            # 상태별 순번: V_n = (1-α)^n V_0 + Σ α(1-α)^(n-1-k) G_k
+            order = np.argsort(state_ids, kind='stable')
+            ranks = np.empty_like(order)
+            ranks[order] = np.arange(len(order)) - np.repeat(np.cumsum(counts) - counts, counts)
+            decay = 1.0 - self.step_size
+            weighted = np.bincount(state_ids, weights=self.step_size * decay ** (counts[state_ids] - 1 - ranks) * returns,
+                                   minlength=num_states)
+            self.values = decay ** counts * self.values + weighted
+        
+        self.merge_statistics(counts, sums, m2s)
+    
+    def merge_statistics(self, counts, sums, m2s):
+        """
+        상태 인덱스 순서 배열 (방문 횟수, 반환값 합, 편차 제곱합)을 기존 통계량에 병합 (Chan 병렬 알고리즘)
+        표본 평균 모드에서는 가치 함수도 병합된 평균으로 갱신한다.
+        """
+        seen = counts > 0
+        count_a, count_b = self.visit_counts[seen], counts[seen]
+        count = count_a + count_b
+        delta = sums[seen] / count_b - self.mean_returns[seen]
+        self.mean_returns[seen] += delta * count_b / count
+        self.m2[seen] += m2s[seen] + delta ** 2 * count_a * count_b / count
+        self.visit_counts[seen] = count
+        
+        if self.step_size is None:
+            self.values[seen] = self.mean_returns[seen]
+    
+    def get_statistics(self):
+        """상태 인덱스 순서 배열 (방문 횟수, 반환값 합, 편차 제곱합) 반환 (merge_statistics의 입력 형식)"""
+        return self.visit_counts.copy(), self.visit_counts * self.mean_returns, self.m2.copy()
+    
+    def predict_parallel(self, num_episodes, policy, num_workers=None, seed=0, batch_size=1000):
+        """
+        에피소드를 워커 프로세스에 나눠 생성하는 몬테카를로 예측 (표본 평균 모드 전용)
+        각 워커는 SeedSequence(seed)에서 분기한 독립 난수 생성기를 쓰며,
+        반환값 대신 상태별 (방문 횟수, 반환값 합, 편차 제곱합)만 돌려주고 워커 순서대로 병합된다.
+        seed와 워커 수가 같으면 결과도 같다.
+        워커의 통계량은 모두 병합된 뒤에야 하나의 가치 함수가 되므로, history_interval과 관계없이
+        가치 함수 스냅샷은 마지막에 한 번만 기록된다.
+        """
+        if self.step_size is not None:
+            raise ValueError("병렬 예측은 표본 평균 모드(step_size=None)에서만 사용할 수 있습니다.")
+        num_workers = num_workers or os.cpu_count() or 1
+        
+        self.reset()
+        self.value_history = ValueHistory(self.env, 1, self.history_memory_budget, self.history_path)
+        
+        # 워커별 에피소드 수 (앞 워커부터 나머지를 하나씩 더 배분)
+        shares = [num_episodes // num_workers + (i < num_episodes % num_workers) for i in range(num_workers)]
+        seed_seqs = np.random.SeedSequence(seed).spawn(num_workers)
+        
+        with ProcessPoolExecutor(max_workers=num_workers) as executor:
+            futures = [
+                executor.submit(_predict_worker, self.env, policy, self.gamma, share, seed_seq, batch_size)
+                for share, seed_seq in zip(shares, seed_seqs)
+            ]
+            # 완료 순서와 관계없이 워커 순서대로 병합
+            for future in futures:
+                self.merge_statistics(*future.result())
+        
+        self.record_history(num_episodes - 1)
+        return self.values, self.value_history, self.visit_counts
+    
     def predict(self, num_episodes, policy):
         """몬테카를로 예측 수행"""
         self.reset()
+        self.value_history = self._make_history(num_episodes)
         
         for i in range(num_episodes):
             # 에피소드 생성
@@ -52,24 +350,61 @@ class MonteCarloPredictor:
                 
                 # 첫 방문 몬테카를로 방식 - 이미 계산한 상태는 건너뜀
                 if state in states_in_episode:
-                    self.returns[state].append(G)
-                    self.values[state] = np.mean(self.returns[state])
-                    self.visit_counts[state] += 1
+                    self.update(state, G)
                     states_in_episode.remove(state)
             
-            # 현재 가치 함수 저장
-            if i % 10 == 0 or i == num_episodes - 1:  # 10 에피소드마다 또는 마지막에 저장
-                value_snapshot = dict(self.values)
-                self.value_history.append((i, value_snapshot))
+            # 현재 가치 함수 저장 (history_interval 에피소드마다 또는 마지막에)
+            if i % self.history_interval == 0 or i == num_episodes - 1:
+                self.record_history(i)
         
         return self.values, self.value_history, self.visit_counts
     
-    def get_value_table(self):
-        """모든 상태에 대한 가치 함수 테이블 반환"""
-        all_states = self.env.get_all_states()
-        value_table = {}
+    def _make_history(self, num_episodes, num_batches=None):
+        """num_episodes 동안 기록될 스냅샷 수만큼 미리 할당한 ValueHistory 생성 (배치 단위면 배치 수 이하)"""
+        capacity = (num_episodes - 1) // self.history_interval + 2 if num_episodes > 0 else 0
+        if num_batches is not None:
+            capacity = min(capacity, num_batches)
+        return ValueHistory(self.env, capacity, self.history_memory_budget, self.history_path)
+    
+    def _history_due(self, first, end, num_episodes):
+        """에피소드 [first, end) 묶음이 history_interval의 배수 번째 에피소드를 포함하거나 마지막 묶음인지"""
+        next_multiple = -(-first // self.history_interval) * self.history_interval
+        return next_multiple < end or end == num_episodes
+    
+    def record_history(self, episode):
+        """현재 가치 함수를 상태 순서의 배열 한 행으로 스냅샷 기록"""
+        self.value_history.append(episode, self.values)
+    
+    def update(self, state, G):
+        """반환값 하나로 상태의 충분 통계량과 가치 함수를 증분 갱신"""
+        state = self.env.get_state_index(state)
+        count = self.visit_counts[state] + 1
+        self.visit_counts[state] = count
         
-        for state in all_states:
-            value_table[state] = self.values.get(state, 0.0)
-            
-        return value_table
\ No newline at end of file
+        # 웰포드 알고리즘: 평균과 편차 제곱합
+        delta = G - self.mean_returns[state]
+        self.mean_returns[state] += delta / count
+        self.m2[state] += delta * (G - self.mean_returns[state])
+        
+        if self.step_size is None:
+            self.values[state] = self.mean_returns[state]
+        else:
+            self.values[state] += self.step_size * (G - self.values[state])
+    
+    def get_variances(self):
+        """상태별 반환값의 표본 분산 (방문 2회 미만은 nan)"""
+        return np.divide(self.m2, self.visit_counts - 1, out=np.full(self.num_states, np.nan),
+                         where=self.visit_counts > 1)
+    
+    def get_standard_errors(self):
+        """상태별 가치 추정(표본 평균)의 표준 오차 (방문 2회 미만은 nan)"""
+        return np.sqrt(self.get_variances() / np.maximum(self.visit_counts, 1))
+    
+    def get_confidence_intervals(self, z=1.96):
+        """상태별 가치 추정의 정규 근사 신뢰구간 (기본 95%), 반환값: (하한 배열, 상한 배열)"""
+        se = self.get_standard_errors()
+        return self.mean_returns - z * se, self.mean_returns + z * se
+    
+    def get_value_table(self):
+        """모든 상태에 대한 가치 함수 테이블 반환 ((에너지, 위치) 2차원 배열)"""
+        return self.env.to_grid(self.values)
@@ -0,0 +1,36 @@
+import os
+import time
+import numpy as np
+from jump_game_env import JumpGameEnv
+from policies import RandomPolicy
+from monte_carlo_prediction import MonteCarloPredictor
+
+def main():
+    # 워커 수에 따른 병렬 몬테카를로 예측 처리량 비교 (전체 에피소드 수는 고정)
+    env = JumpGameEnv()
+    policy = RandomPolicy(env)
+    num_episodes = 400000
+    seed = 42
+
+    print("=== 병렬 몬테카를로 예측 ===")
+    print(f"에피소드 {num_episodes}개, CPU 코어 {os.cpu_count()}개")
+    base_speed = None
+    worker_counts = sorted({1, 2, 4, os.cpu_count() or 1})
+    for num_workers in worker_counts:
+        predictor = MonteCarloPredictor(env)
+        start = time.perf_counter()
+        values, _, _ = predictor.predict_parallel(num_episodes, policy, num_workers=num_workers, seed=seed)
+        elapsed = time.perf_counter() - start
+
+        # 같은 시드와 워커 수로 다시 실행해 재현성 확인
+        repeat = MonteCarloPredictor(env)
+        repeat_values, _, _ = repeat.predict_parallel(num_episodes, policy, num_workers=num_workers, seed=seed)
+        reproducible = np.array_equal(values, repeat_values)
+
+        speed = num_episodes / elapsed
+        base_speed = base_speed or speed
+        print(f"워커 {num_workers}개: {elapsed:.2f}초 ({speed:,.0f} 에피소드/초, {speed / base_speed:.2f}배), "
+              f"V(시작) = {values[env.get_state_index(env.reset())]:.4f}, 재현 {reproducible}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+import numpy as np
+
+class StochasticPolicy:
+    """
+    점프 게임 확률 정책의 기반 클래스
+    하위 클래스는 jump_probability만 정의하면 되며, 상태는 스칼라 (위치, 에너지) 튜플이나
+    위치/에너지 배열 튜플 모두 받을 수 있다.
+    """
+    def __init__(self, env):
+        self.env = env
+        obstacles = np.zeros(env.goal + 3, dtype=bool)
+        obstacles[list(env.obstacles)] = True
+        # 위치별 바로 앞 장애물 여부와 목표 전까지 남은 장애물 수
+        self.obstacle_ahead = obstacles[1:env.goal + 2]
+        self.obstacles_ahead = obstacles[:env.goal].sum() - np.cumsum(obstacles[:env.goal + 1])
+
+    def jump_probability(self, positions, energies):
+        """상태(배열)별 점프 확률"""
+        raise NotImplementedError
+
+    def action_probabilities(self, state):
+        """상태(배열)별 행동 확률 [걷기, 점프] (마지막 축이 행동)"""
+        position, energy = state
+        p = self.jump_probability(np.asarray(position), np.asarray(energy))
+        return np.stack([1.0 - p, p], axis=-1)
+
+    def __call__(self, state, rng=np.random):
+        """행동 샘플링: 스칼라 상태면 정수, 배열 상태면 행동 배열 반환"""
+        position, energy = state
+        p = self.jump_probability(np.asarray(position), np.asarray(energy))
+        actions = (rng.random(p.shape) < p).astype(np.int64)
+        return int(actions) if actions.ndim == 0 else actions
+
+class RandomPolicy(StochasticPolicy):
+    """무작위 정책: 가능한 행동 중 무작위로 선택"""
+    def jump_probability(self, positions, energies):
+        return np.select(
+            [
+                energies == 0,  # 에너지가 없으면 걷기만 가능
+                self.obstacle_ahead[positions],  # 장애물이 있고 점프할 수 있으면 점프
+            ],
+            [0.0, 1.0],
+            default=0.5,  # 그 외에는 무작위 선택
+        )
+
+class BetterPolicy(StochasticPolicy):
+    """더 나은 정책: 가능한 행동 중 현명한 선택"""
+    def jump_probability(self, positions, energies):
+        distance_to_goal = self.env.goal - positions
+        obstacles_ahead = self.obstacles_ahead[positions]
+        return np.select(
+            [
+                energies == 0,  # 에너지가 없으면 걷기만 가능
+                self.obstacle_ahead[positions],  # 장애물이 바로 앞에 있는 경우 (절대 점프)
+                distance_to_goal <= 2,  # 목표가 2칸 이내에 있으면 걷기
+                (distance_to_goal <= 4) & (obstacles_ahead > 0),  # 목표가 가까운데 앞에 장애물이 있으면 점프로 넘기
+                obstacles_ahead >= energies,  # 장애물이 많으면 에너지 아껴서 걷기
+                energies >= 2,  # 에너지가 충분하면 점프 확률 높임
+            ],
+            [0.0, 1.0, 0.0, 1.0, 0.0, 0.5],
+            default=0.2,  # 에너지가 1이면 걷기를 선호하되 가끔 점프
+        )
@@ -3,24 +3,30 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 from matplotlib.animation import FuncAnimation
 
+# 칸마다 값을 표시할 최대 게임판 크기 (더 크면 색만 표시)
+MAX_ANNOTATED_CELLS = 400
+
+# 장애물 위치를 선으로 표시할 최대 장애물 수
+MAX_OBSTACLE_LINES = 100
+
+def _draw_obstacles(env):
+    """장애물 위치 표시 (장애물이 많으면 생략)"""
+    if len(env.obstacles) <= MAX_OBSTACLE_LINES:
+        for obs in env.obstacles:
+            plt.axvline(x=obs + 0.5, color='r', linestyle='--', alpha=0.5)
+
 def plot_value_function(value_table, env):
-    """상태 가치 함수 히트맵 시각화"""
-    # 데이터 준비
-    positions = range(env.board_size)
-    max_energy = 4  # 에너지 최대값 조정 (0, 1, 2, 3)
-    
-    # 2D 배열로 변환
-    value_grid = np.zeros((max_energy, env.board_size))
-    for pos in positions:
-        for energy in range(max_energy):
-            value_grid[energy, pos] = value_table.get((pos, energy), 0)
+    """상태 가치 함수 히트맵 시각화 (value_table: (에너지, 위치) 배열 또는 상태 인덱스 순서 배열)"""
+    # (에너지, 위치) 2D 배열로 변환
+    value_grid = np.asarray(value_table)
+    if value_grid.ndim == 1:
+        value_grid = env.to_grid(value_grid)
     
     plt.figure(figsize=(12, 5))
-    sns.heatmap(value_grid, annot=True, fmt=".2f", cmap="YlGnBu")
+    sns.heatmap(value_grid, annot=value_grid.size <= MAX_ANNOTATED_CELLS, fmt=".2f", cmap="YlGnBu")
     
     # 장애물 위치 표시
-    for obs in env.obstacles:
-        plt.axvline(x=obs + 0.5, color='r', linestyle='--', alpha=0.5)
+    _draw_obstacles(env)
     
     plt.xlabel("Position")
     plt.ylabel("Energy")
@@ -35,12 +41,13 @@ def visualize_value_convergence(value_history, env, key_states=None):
         # 기본 관찰 상태
         key_states = [(0, 2), (2, 2), (4, 1), (7, 0)]
     
-    episodes = [h[0] for h in value_history]
+    # 스냅샷 배열(ValueHistory)에서 직접 읽기
+    episodes = value_history.episodes[:len(value_history)]
     
     plt.figure(figsize=(10, 6))
     
     for state in key_states:
-        values = [h[1].get(state, 0) for h in value_history]
+        values = value_history.get(state)
         plt.plot(episodes, values, marker='o', label=f"State {state}")
     
     plt.xlabel("Episodes")
@@ -52,24 +59,16 @@ def visualize_value_convergence(value_history, env, key_states=None):
     return plt
 
 def plot_visit_counts(visit_counts, env):
-    """상태 방문 횟수 시각화"""
-    # 데이터 준비
-    positions = range(env.board_size)
-    max_energy = 4  # 에너지 최대값 조정 (0, 1, 2, 3)
-    
-    # 2D 배열로 변환
-    count_grid = np.zeros((max_energy, env.board_size))
-    for pos in positions:
-        for energy in range(max_energy):
-            count_grid[energy, pos] = visit_counts.get((pos, energy), 0)
+    """상태 방문 횟수 시각화 (visit_counts: 상태 인덱스 순서 배열)"""
+    # (에너지, 위치) 2D 배열로 변환
+    count_grid = env.to_grid(visit_counts)
     
     plt.figure(figsize=(12, 5))
     # fmt 형식 변경: "d" -> ".0f"
-    sns.heatmap(count_grid, annot=True, fmt=".0f", cmap="Greens")
+    sns.heatmap(count_grid, annot=count_grid.size <= MAX_ANNOTATED_CELLS, fmt=".0f", cmap="Greens")
     
     # 장애물 위치 표시
-    for obs in env.obstacles:
-        plt.axvline(x=obs + 0.5, color='r', linestyle='--', alpha=0.5)
+    _draw_obstacles(env)
     
     plt.xlabel("Position")
     plt.ylabel("Energy")
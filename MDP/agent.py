@@ -1,15 +1,23 @@
+import heapq
 import numpy as np
-import random
+from collections import defaultdict
 
 class QLearningAgent:
-    def __init__(self, env, learning_rate=0.1, discount_factor=0.9, epsilon=0.1):
+    def __init__(self, env, learning_rate=0.1, discount_factor=0.9, epsilon=0.1, seed=None, q_table=None):
         self.env = env
         self.learning_rate = learning_rate  # 학습률
         self.discount_factor = discount_factor  # 할인계수
         self.epsilon = epsilon  # 탐험률
         
-        # Q-테이블 초기화 (상태 x 액션)
-        self.q_table = np.zeros((env.size * env.size, env.action_space))
+        # Q-테이블 초기화 (상태 x 액션), 메모리 맵 배열 등 외부 배열을 그대로 쓸 수도 있음
+        if q_table is None:
+            q_table = np.zeros((env.num_states, env.action_space))
+        elif q_table.shape != (env.num_states, env.action_space):
+            raise ValueError(f"Q 테이블 크기 {q_table.shape}가 환경과 맞지 않습니다.")
+        self.q_table = q_table
+        
+        # 행동 선택용 난수 생성기 (스텝마다 균등 난수 하나만 사용)
+        self.rng = np.random.default_rng(seed)
         
     def select_action(self, state):
         """
@@ -18,12 +26,20 @@ class QLearningAgent:
         state_idx = self.env.get_state_index(state)
         
         # 탐험: 랜덤 액션
-        if random.random() < self.epsilon:
-            return random.randint(0, self.env.action_space - 1)
+        u = self.rng.random()
+        if u < self.epsilon:
+            return self.explore_action(u)
         # 활용: 최대 Q값을 갖는 액션
         else:
             return np.argmax(self.q_table[state_idx])
     
+    def explore_action(self, u):
+        """
+        u < epsilon인 균등 난수를 균등한 랜덤 액션으로 변환
+        (탐험 여부와 액션을 난수 하나로 정하므로 난수를 블록 단위로 미리 뽑아도 결과가 같다)
+        """
+        return min(int(u / self.epsilon * self.env.action_space), self.env.action_space - 1)
+    
     def learn(self, state, action, reward, next_state, done):
         """
         Q-러닝 업데이트 규칙을 사용하여 Q 테이블 업데이트
@@ -46,12 +62,160 @@ class QLearningAgent:
         # Q-테이블 업데이트
         self.q_table[state_idx, action] += self.learning_rate * (target_q - current_q)
     
+    def select_action_batch(self, state_indices):
+        """
+        정수 상태 인덱스 배열에 대해 입실론-탐욕 행동을 한 번에 선택
+        """
+        actions = np.argmax(self.q_table[state_indices], axis=1)
+        u = self.rng.random(len(state_indices))
+        explore = u < self.epsilon
+        random_actions = (u[explore] / self.epsilon * self.env.action_space).astype(np.int64)
+        actions[explore] = np.minimum(random_actions, self.env.action_space - 1)
+        return actions
+    
+    def learn_batch(self, state_indices, actions, rewards, next_state_indices, dones):
+        """
+        전이 배치 전체로 Q 테이블을 한 번에 업데이트
+        같은 (상태, 액션)이 배치에 여러 번 나오면 TD 오차의 평균으로 한 번 갱신
+        """
+        current_q = self.q_table[state_indices, actions]
+        max_next_q = np.max(self.q_table[next_state_indices], axis=1)
+        target_q = np.where(dones, rewards, rewards + self.discount_factor * max_next_q)
+        
+        # 중복된 (상태, 액션) 쌍의 TD 오차 평균
+        flat_indices = state_indices * self.env.action_space + actions
+        unique_indices, inverse, counts = np.unique(flat_indices, return_inverse=True, return_counts=True)
+        td_sums = np.bincount(inverse, weights=target_q - current_q, minlength=len(unique_indices))
+        
+        q_flat = self.q_table.reshape(-1)
+        q_flat[unique_indices] += self.learning_rate * td_sums / counts
+    
     def get_optimal_policy(self):
         """
         학습된 Q-테이블을 바탕으로 최적 정책 반환
         """
-        policy = {}
-        for state in self.env.get_all_states():
-            state_idx = self.env.get_state_index(state)
-            policy[state] = np.argmax(self.q_table[state_idx])
-        return policy
\ No newline at end of file
+        actions = np.argmax(self.q_table[self.env.get_all_state_indices()], axis=1)
+        return dict(zip(self.env.get_all_states(), actions.tolist()))
+    
+    def get_policy_array(self):
+        """
+        탐욕 정책을 (높이, 너비) 행동 배열로 한 번에 추출 (장애물은 -1)
+        """
+        policy = np.argmax(self.q_table, axis=1).reshape(self.env.height, self.env.width)
+        policy[np.asarray(self.env.walls, dtype=bool)] = -1
+        return policy
+    
+    def get_value_array(self):
+        """
+        상태 가치 max_a Q(s, a)를 (높이, 너비) 배열로 한 번에 추출 (장애물은 NaN)
+        """
+        values = np.max(self.q_table, axis=1).reshape(self.env.height, self.env.width)
+        values[np.asarray(self.env.walls, dtype=bool)] = np.nan
+        return values
+
+
+class DynaQAgent(QLearningAgent):
+    """
+    관찰한 전이로 환경 모델을 학습하고, 실제 스텝마다 모델에서 planning_steps번 가상 백업을 수행하는 에이전트
+    
+    - prioritized=False: Dyna-Q. 실제 백업 후 관찰한 (상태, 액션)을 균등 샘플링해 하나씩 백업
+    - prioritized=True: 우선순위 스위핑. TD 오차 크기를 키로 하는 힙과 선행 상태 추적으로
+      값이 바뀐 상태의 선행 (상태, 액션)부터 백업 (실제 전이도 큐를 통해 백업)
+    """
+    def __init__(self, env, learning_rate=0.1, discount_factor=0.9, epsilon=0.1, seed=None,
+                 planning_steps=5, prioritized=False, theta=1e-4):
+        super().__init__(env, learning_rate, discount_factor, epsilon, seed)
+        self.planning_steps = planning_steps
+        self.prioritized = prioritized
+        self.theta = theta  # 우선순위 큐에 넣을 최소 TD 오차
+        
+        # 결정적 환경 모델: 평탄화된 (상태, 액션) 인덱스 -> (다음 상태, 보상, 종료 여부)
+        num_pairs = env.num_states * env.action_space
+        self.model_next_state = np.full(num_pairs, -1, dtype=np.int64)
+        self.model_reward = np.zeros(num_pairs)
+        self.model_done = np.zeros(num_pairs, dtype=bool)
+        
+        # 관찰한 (상태, 액션) 목록 (균등 샘플링용)
+        self.observed = np.zeros(num_pairs, dtype=np.int64)
+        self.num_observed = 0
+        
+        # 우선순위 스위핑: 최대 힙(음수 우선순위)과 다음 상태별 선행 (상태, 액션)
+        self.queue = []
+        self.queued_priority = {}
+        self.predecessors = defaultdict(set)
+        
+        # 누적 백업 횟수 (실제 + 가상)
+        self.num_backups = 0
+    
+    def update_model(self, state_idx, action, reward, next_state_idx, done):
+        """관찰한 전이를 모델 배열에 기록"""
+        pair = state_idx * self.env.action_space + action
+        if self.model_next_state[pair] < 0:
+            self.observed[self.num_observed] = pair
+            self.num_observed += 1
+        self.model_next_state[pair] = next_state_idx
+        self.model_reward[pair] = reward
+        self.model_done[pair] = done
+        self.predecessors[next_state_idx].add(pair)
+    
+    def learn(self, state, action, reward, next_state, done):
+        """
+        실제 전이로 모델을 갱신하고 planning_steps번 모델 기반 백업 수행
+        """
+        state_idx = self.env.get_state_index(state)
+        next_state_idx = self.env.get_state_index(next_state)
+        self.update_model(state_idx, action, reward, next_state_idx, done)
+        
+        if self.prioritized:
+            self._push(state_idx * self.env.action_space + action)
+            self._sweep()
+        else:
+            super().learn(state, action, reward, next_state, done)
+            self.num_backups += 1
+            self._plan()
+    
+    def _td_error(self, pair):
+        """모델로 예측한 (상태, 액션)의 TD 오차"""
+        q_flat = self.q_table.reshape(-1)
+        target_q = self.model_reward[pair]
+        if not self.model_done[pair]:
+            target_q += self.discount_factor * np.max(self.q_table[self.model_next_state[pair]])
+        return target_q - q_flat[pair]
+    
+    def _plan(self):
+        """
+        Dyna-Q: 관찰한 (상태, 액션)을 균등 샘플링해 하나씩 차례로 백업
+        (앞선 백업이 바꾼 Q값을 다음 백업이 바로 읽으므로 한 번의 계획 단계 안에서도 가치가 전파됨)
+        """
+        if self.planning_steps <= 0 or self.num_observed == 0:
+            return
+        q_flat = self.q_table.reshape(-1)
+        for pair in self.observed[self.rng.integers(0, self.num_observed, self.planning_steps)].tolist():
+            q_flat[pair] += self.learning_rate * self._td_error(pair)
+        self.num_backups += self.planning_steps
+    
+    def _push(self, pair):
+        """TD 오차가 theta보다 크면 더 높은 우선순위로 큐에 넣음 (오래된 항목은 꺼낼 때 무시)"""
+        priority = abs(self._td_error(pair))
+        if priority > self.theta and priority > self.queued_priority.get(pair, 0.0):
+            self.queued_priority[pair] = priority
+            heapq.heappush(self.queue, (-priority, pair))
+    
+    def _sweep(self):
+        """우선순위 스위핑: 큐에서 꺼낸 (상태, 액션)을 백업하고 선행 (상태, 액션)의 우선순위 갱신"""
+        q_flat = self.q_table.reshape(-1)
+        for _ in range(self.planning_steps + 1):
+            # 갱신되어 무효가 된 항목 건너뛰기
+            while self.queue and self.queued_priority.get(self.queue[0][1]) != -self.queue[0][0]:
+                heapq.heappop(self.queue)
+            if not self.queue:
+                break
+            _, pair = heapq.heappop(self.queue)
+            del self.queued_priority[pair]
+            
+            q_flat[pair] += self.learning_rate * self._td_error(pair)
+            self.num_backups += 1
+            
+            # 값이 바뀐 상태로 이어지는 선행 (상태, 액션)들의 우선순위 갱신
+            for predecessor in self.predecessors[pair // self.env.action_space]:
+                self._push(predecessor)
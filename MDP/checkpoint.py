@@ -0,0 +1,99 @@
+import os
+import json
+import numpy as np
+from agent import QLearningAgent
+
+# 체크포인트 디렉터리 안의 파일 이름
+Q_TABLE_FILE = 'q_table.npy'
+REWARDS_FILE = 'rewards.npy'
+STATE_FILE = 'state.json'
+
+def _atomic_save_npy(path, array):
+    """임시 파일에 쓴 뒤 교체하여 중간에 중단되어도 이전 파일이 깨지지 않게 저장"""
+    tmp_path = path + '.tmp.npy'
+    np.save(tmp_path, array)
+    os.replace(tmp_path, path)
+
+def open_q_table_memmap(checkpoint_dir, shape, resume=False):
+    """
+    체크포인트 디렉터리의 Q 테이블을 메모리 맵 .npy 파일로 열기
+    학습 중 Q 테이블이 RAM이 아닌 파일에 놓이므로 큰 맵에서도 크기가 RAM에 제한되지 않는다.
+    """
+    os.makedirs(checkpoint_dir, exist_ok=True)
+    path = os.path.join(checkpoint_dir, Q_TABLE_FILE)
+    if resume and os.path.exists(path):
+        q_table = np.load(path, mmap_mode='r+')
+        if q_table.shape != tuple(shape):
+            raise ValueError(f"체크포인트 Q 테이블 크기 {q_table.shape}가 {tuple(shape)}와 다릅니다.")
+        return q_table
+    return np.lib.format.open_memmap(path, mode='w+', dtype=np.float64, shape=tuple(shape))
+
+def save_checkpoint(checkpoint_dir, agent, episode, episode_rewards):
+    """
+    Q 테이블, 엡실론, 난수 생성기 상태, 완료한 에피소드 수와 보상 기록 저장
+    state.json을 마지막에 교체하므로 state.json이 가리키는 시점이 최신 체크포인트이다.
+    (Q 테이블이 체크포인트 파일에 메모리 맵된 경우에는 flush만 하므로
+    중단 시 Q 테이블이 state.json보다 최대 한 저장 주기만큼 앞설 수 있다.)
+    """
+    os.makedirs(checkpoint_dir, exist_ok=True)
+    q_path = os.path.join(checkpoint_dir, Q_TABLE_FILE)
+
+    if _is_checkpoint_memmap(agent.q_table, checkpoint_dir):
+        agent.q_table.flush()
+    else:
+        _atomic_save_npy(q_path, agent.q_table)
+    _atomic_save_npy(os.path.join(checkpoint_dir, REWARDS_FILE), np.asarray(episode_rewards, dtype=np.float64))
+
+    state = {
+        'episode': episode,
+        'epsilon': agent.epsilon,
+        'learning_rate': agent.learning_rate,
+        'discount_factor': agent.discount_factor,
+        'q_table_shape': list(agent.q_table.shape),
+        'rng_state': agent.rng.bit_generator.state,
+    }
+    state_path = os.path.join(checkpoint_dir, STATE_FILE)
+    with open(state_path + '.tmp', 'w') as f:
+        json.dump(state, f)
+    os.replace(state_path + '.tmp', state_path)
+
+def load_checkpoint(checkpoint_dir, mmap_mode='r'):
+    """
+    체크포인트 읽기
+    반환값: (메모리 맵 Q 테이블, 상태 딕셔너리, 보상 기록 리스트)
+    """
+    with open(os.path.join(checkpoint_dir, STATE_FILE)) as f:
+        state = json.load(f)
+    q_table = np.load(os.path.join(checkpoint_dir, Q_TABLE_FILE), mmap_mode=mmap_mode)
+    rewards = np.load(os.path.join(checkpoint_dir, REWARDS_FILE)).tolist()
+    return q_table, state, rewards
+
+def has_checkpoint(checkpoint_dir):
+    """체크포인트 디렉터리에 재개 가능한 체크포인트가 있는지 확인"""
+    return checkpoint_dir is not None and os.path.exists(os.path.join(checkpoint_dir, STATE_FILE))
+
+def _is_checkpoint_memmap(q_table, checkpoint_dir):
+    """Q 테이블이 체크포인트의 Q 테이블 파일에 메모리 맵된 배열인지 확인"""
+    return (isinstance(q_table, np.memmap) and q_table.filename is not None
+            and os.path.abspath(q_table.filename) == os.path.abspath(os.path.join(checkpoint_dir, Q_TABLE_FILE)))
+
+def restore_agent(agent, checkpoint_dir):
+    """
+    최신 체크포인트의 Q 테이블, 엡실론, 난수 생성기 상태를 에이전트에 적용
+    반환값: (완료한 에피소드 수, 보상 기록 리스트)
+    """
+    q_table, state, rewards = load_checkpoint(checkpoint_dir)
+    if not _is_checkpoint_memmap(agent.q_table, checkpoint_dir):
+        agent.q_table[:] = q_table
+    agent.epsilon = state['epsilon']
+    agent.rng.bit_generator.state = state['rng_state']
+    return state['episode'], rewards
+
+def load_agent(checkpoint_dir, env):
+    """
+    재학습 없이 정책을 서빙하기 위한 읽기 전용 에이전트 생성
+    Q 테이블은 읽기 전용 메모리 맵이며 엡실론은 0 (항상 탐욕 행동)
+    """
+    q_table, state, _ = load_checkpoint(checkpoint_dir, mmap_mode='r')
+    return QLearningAgent(env, learning_rate=state['learning_rate'], discount_factor=state['discount_factor'],
+                          epsilon=0.0, q_table=q_table)
@@ -0,0 +1,60 @@
+import time
+from types import SimpleNamespace
+import numpy as np
+from environment import GridWorld
+from agent import QLearningAgent, DynaQAgent
+from planner import value_iteration
+from train import train_agent, visualize_path
+
+def optimal_path_length(env):
+    """가치 반복으로 구한 최적 정책의 시작-목표 경로 길이"""
+    q_table, _, _ = value_iteration(env)
+    return len(visualize_path(env, SimpleNamespace(q_table=q_table))) - 1
+
+def episodes_to_convergence(agent, optimal_length, max_episodes):
+    """
+    탐욕 정책의 경로가 최적 길이가 될 때까지 train_agent로 학습
+    반환값: (에피소드 수 또는 수렴 실패 시 None, 걸린 시간)
+    """
+    def converged(env, agent):
+        path = visualize_path(env, agent, max_steps=optimal_length)
+        return path[-1] == env.goal and len(path) - 1 == optimal_length
+
+    start = time.perf_counter()
+    _, _, rewards = train_agent(num_episodes=max_episodes, agent=agent, verbose=False,
+                                stop_condition=converged)
+    elapsed = time.perf_counter() - start
+    return (len(rewards) if converged(agent.env, agent) else None), elapsed
+
+def main():
+    configs = {
+        '5x5 기본 맵': lambda: GridWorld(size=5),
+        '15x15 무작위 맵': lambda: GridWorld.random_map(15, 15, wall_prob=0.2, seed=0),
+    }
+    methods = {
+        'Q-러닝': lambda env, seed: QLearningAgent(env, seed=seed),
+        'Dyna-Q (k=5)': lambda env, seed: DynaQAgent(env, seed=seed, planning_steps=5),
+        'Dyna-Q (k=20)': lambda env, seed: DynaQAgent(env, seed=seed, planning_steps=20),
+        '우선순위 스위핑 (k=5)': lambda env, seed: DynaQAgent(env, seed=seed, planning_steps=5, prioritized=True),
+        '우선순위 스위핑 (k=20)': lambda env, seed: DynaQAgent(env, seed=seed, planning_steps=20, prioritized=True),
+    }
+    seeds = range(5)
+    max_episodes = 3000
+
+    print("=== Dyna-Q / 우선순위 스위핑 vs Q-러닝 ===")
+    for config_name, make_env in configs.items():
+        optimal_length = optimal_path_length(make_env())
+        print(f"\n[{config_name}] 최적 경로 길이: {optimal_length} 스텝")
+        for method_name, make_agent in methods.items():
+            episodes, times = [], []
+            for seed in seeds:
+                agent = make_agent(make_env(), seed)
+                num_episodes, elapsed = episodes_to_convergence(agent, optimal_length, max_episodes)
+                episodes.append(np.nan if num_episodes is None else num_episodes)
+                times.append(elapsed)
+            failed = int(np.sum(np.isnan(episodes)))
+            print(f"{method_name:>16}: 수렴 에피소드 중앙값 {np.nanmedian(episodes) if failed < len(seeds) else float('nan'):.0f}, "
+                  f"평균 시간 {np.mean(times):.3f}초, 수렴 실패 {failed}/{len(seeds)}")
+
+if __name__ == "__main__":
+    main()
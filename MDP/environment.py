@@ -1,15 +1,116 @@
 import numpy as np
 
 class GridWorld:
-    def __init__(self, size=5):
-        self.size = size
-        self.obstacles = [(1, 1), (2, 2), (3, 1)]  # 장애물 위치
-        self.goal = (4, 4)  # 목표 위치
-        self.start = (0, 0)  # 시작 위치
+    """
+    격자 세계 환경
+    장애물은 (높이, 너비) 크기의 bool 점유 배열(True: 벽)로 저장하며,
+    np.memmap으로 연 배열을 그대로 사용할 수 있다.
+    """
+    # 텍스트 맵 문자
+    WALL, START, GOAL = '#', 'S', 'G'
+    # 정수 코드 맵 값 (0: 빈칸)
+    WALL_CODE, START_CODE, GOAL_CODE = 1, 2, 3
+    
+    def __init__(self, size=5, walls=None, start=(0, 0), goal=None):
+        """
+        walls가 없으면 size x size 기본 맵, goal이 없으면 오른쪽 아래 구석 (높이 - 1, 너비 - 1)이 목표
+        (예전에는 size와 관계없이 (4, 4)였으므로 size=5에서만 같음)
+        """
+        if walls is None:
+            # 기본 5x5 맵의 장애물 위치
+            walls = np.zeros((size, size), dtype=bool)
+            for x, y in [(1, 1), (2, 2), (3, 1)]:
+                if x < size and y < size:
+                    walls[x, y] = True
+        
+        self.walls = walls  # 장애물 점유 배열
+        self.height, self.width = walls.shape
+        self.num_states = self.height * self.width
+        self.start = tuple(int(v) for v in start)  # 시작 위치
+        self.goal = (self.height - 1, self.width - 1) if goal is None else tuple(int(v) for v in goal)  # 목표 위치
+        
+        for name, position in (("시작", self.start), ("목표", self.goal)):
+            if not self.in_bounds(position) or self.is_obstacle(position):
+                raise ValueError(f"{name} 위치 {position}가 맵 밖이거나 장애물입니다.")
         
         # 액션: 0: 위, 1: 오른쪽, 2: 아래, 3: 왼쪽
         self.action_space = 4
         self.current_state = self.start
+    
+    @classmethod
+    def from_file(cls, path, start=None, goal=None, **kwargs):
+        """
+        맵 파일로부터 환경 생성
+        - 텍스트 파일: '#' 벽, 'S' 시작, 'G' 목표, 그 외 문자는 빈칸
+        - .npy 파일: bool 배열(True: 벽) 또는 정수 코드 배열(0 빈칸, 1 벽, 2 시작, 3 목표)
+          bool 배열은 np.memmap으로 열어 맵 전체를 메모리에 올리지 않음
+        start, goal을 지정하면 파일의 시작/목표 표시보다 우선한다.
+        """
+        if str(path).endswith('.npy'):
+            grid = np.load(path, mmap_mode='r')
+            if grid.dtype == np.bool_:
+                walls = grid
+                codes = None
+            else:
+                walls = np.asarray(grid == cls.WALL_CODE)
+                codes = grid
+        else:
+            with open(path, 'rb') as f:
+                # 줄바꿈만 있는 빈 줄(파일 끝 개행 등)만 건너뜀 (공백만 있는 줄은 빈칸으로 된 행)
+                lines = [line for line in (raw.rstrip(b'\r\n') for raw in f) if line]
+            if len({len(line) for line in lines}) != 1:
+                raise ValueError("텍스트 맵의 모든 줄은 길이가 같아야 합니다.")
+            chars = np.stack([np.frombuffer(line, dtype=np.uint8) for line in lines])
+            walls = chars == ord(cls.WALL)
+            codes = np.where(chars == ord(cls.START), cls.START_CODE,
+                             np.where(chars == ord(cls.GOAL), cls.GOAL_CODE, 0))
+        
+        # 파일에 표시된 시작/목표 위치 찾기
+        if codes is not None:
+            if start is None:
+                found = np.argwhere(codes == cls.START_CODE)
+                start = tuple(found[0]) if len(found) else None
+            if goal is None:
+                found = np.argwhere(codes == cls.GOAL_CODE)
+                goal = tuple(found[0]) if len(found) else None
+        
+        return cls(walls=walls, start=(0, 0) if start is None else start, goal=goal, **kwargs)
+    
+    @classmethod
+    def random_map(cls, height, width, wall_prob=0.2, seed=None, **kwargs):
+        """
+        무작위 장애물 맵 생성 (첫 행과 마지막 열은 비워 시작에서 목표까지 경로를 보장)
+        """
+        rng = np.random.default_rng(seed)
+        walls = rng.random((height, width)) < wall_prob
+        walls[0, :] = False
+        walls[:, -1] = False
+        return cls(walls=walls, **kwargs)
+    
+    def save_walls(self, path):
+        """장애물 점유 배열을 memmap으로 열 수 있는 .npy 파일로 저장"""
+        np.save(path, np.asarray(self.walls, dtype=bool))
+    
+    @property
+    def size(self):
+        """정사각형 맵의 한 변 길이 (기존 코드 호환용)"""
+        if self.height != self.width:
+            raise ValueError("정사각형이 아닌 맵은 height, width를 사용하세요.")
+        return self.height
+    
+    @property
+    def obstacles(self):
+        """장애물 위치 목록 (작은 맵 호환용, 큰 맵은 walls를 직접 사용)"""
+        return [tuple(position) for position in np.argwhere(self.walls).tolist()]
+    
+    def in_bounds(self, state):
+        """상태가 맵 안에 있는지 확인"""
+        x, y = state
+        return 0 <= x < self.height and 0 <= y < self.width
+    
+    def is_obstacle(self, state):
+        """상태가 장애물인지 O(1)로 확인"""
+        return bool(self.walls[state])
         
     def reset(self):
         """환경 초기화 및 초기 상태 반환"""
@@ -27,16 +128,16 @@ class GridWorld:
         if action == 0:  # 위
             next_state = (max(0, x-1), y)
         elif action == 1:  # 오른쪽
-            next_state = (x, min(self.size-1, y+1))
+            next_state = (x, min(self.width-1, y+1))
         elif action == 2:  # 아래
-            next_state = (min(self.size-1, x+1), y)
+            next_state = (min(self.height-1, x+1), y)
         elif action == 3:  # 왼쪽
             next_state = (x, max(0, y-1))
         else:
             raise ValueError("유효하지 않은 액션입니다.")
         
         # 장애물 확인
-        if next_state in self.obstacles:
+        if self.walls[next_state]:
             next_state = self.current_state  # 장애물이면 이동 불가
             
         # 보상 계산
@@ -55,19 +156,76 @@ class GridWorld:
     def get_state_index(self, state):
         """상태(x, y)를 인덱스로 변환"""
         x, y = state
-        return x * self.size + y
+        return x * self.width + y
     
     def get_state_from_index(self, index):
         """인덱스를 상태(x, y)로 변환"""
-        x = index // self.size
-        y = index % self.size
+        x = index // self.width
+        y = index % self.width
         return (x, y)
     
+    def get_all_state_indices(self):
+        """장애물이 아닌 모든 상태의 인덱스 배열 반환"""
+        return np.flatnonzero(~np.asarray(self.walls).reshape(-1))
+    
     def get_all_states(self):
         """가능한 모든 상태 반환"""
-        states = []
-        for i in range(self.size):
-            for j in range(self.size):
-                if (i, j) not in self.obstacles:
-                    states.append((i, j))
-        return states
\ No newline at end of file
+        return [tuple(position) for position in np.argwhere(~np.asarray(self.walls)).tolist()]
+    
+    def get_transition_table(self):
+        """
+        모든 (상태 인덱스, 액션)에 대한 다음 상태 인덱스, 보상, 종료 여부 테이블 반환
+        반환값은 각각 (상태 수, 액션 수) 크기의 배열
+        """
+        x, y = np.divmod(np.arange(self.num_states), self.width)
+        
+        # 액션 순서(위, 오른쪽, 아래, 왼쪽)에 맞춘 다음 좌표
+        next_x = np.stack([np.maximum(0, x-1), x, np.minimum(self.height-1, x+1), x], axis=1)
+        next_y = np.stack([y, np.minimum(self.width-1, y+1), y, np.maximum(0, y-1)], axis=1)
+        next_states = next_x * self.width + next_y
+        del next_x, next_y
+        
+        # 장애물이면 이동 불가
+        blocked = np.asarray(self.walls).reshape(-1)
+        next_states = np.where(blocked[next_states], np.arange(self.num_states)[:, None], next_states)
+        
+        # 보상 및 종료 여부
+        dones = next_states == self.get_state_index(self.goal)
+        rewards = np.where(dones, 1.0, -0.01)
+        return next_states, rewards, dones
+
+
+class BatchGridWorld(GridWorld):
+    """
+    N개의 GridWorld를 정수 상태 배열로 한 번에 진행시키는 벡터화 환경
+    목표에 도달한 환경은 자동으로 시작 상태로 초기화된다.
+    """
+    def __init__(self, num_envs, size=5, walls=None, start=(0, 0), goal=None):
+        super().__init__(size, walls=walls, start=start, goal=goal)
+        self.num_envs = num_envs
+        self.next_state_table, self.reward_table, self.done_table = self.get_transition_table()
+        self.start_index = self.get_state_index(self.start)
+        self.states = np.full(num_envs, self.start_index, dtype=np.int64)
+    
+    def reset(self):
+        """모든 환경 초기화 및 초기 상태 인덱스 배열 반환"""
+        self.states[:] = self.start_index
+        return self.states.copy()
+    
+    def step(self, actions):
+        """
+        액션 배열을 받아 다음 상태 인덱스, 보상, 종료 여부 배열 반환
+        종료된 환경의 다음 상태는 초기화된 시작 상태이며,
+        종료 시 Q-러닝 타깃은 보상뿐이므로 학습에는 영향이 없다.
+        """
+        actions = np.asarray(actions)
+        if np.any((actions < 0) | (actions >= self.action_space)):
+            raise ValueError("유효하지 않은 액션입니다.")
+        
+        next_states = self.next_state_table[self.states, actions]
+        rewards = self.reward_table[self.states, actions]
+        dones = self.done_table[self.states, actions]
+        
+        # 종료된 환경 자동 초기화
+        self.states = np.where(dones, self.start_index, next_states)
+        return self.states.copy(), rewards, dones
\ No newline at end of file
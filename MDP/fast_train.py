@@ -0,0 +1,175 @@
+import time
+import numpy as np
+from environment import GridWorld
+from agent import QLearningAgent
+from train import train_agent
+
+# 한 번에 미리 뽑아 둘 탐험용 균등 난수 개수
+RANDOM_BLOCK_SIZE = 4096
+
+def run_q_learning(q, transitions, start_index, num_episodes, learning_rate,
+                   discount_factor, epsilon, rng, epsilon_decay=0.9, decay_interval=100,
+                   locks=None, on_episode=None):
+    """
+    정수 상태와 다음 상태 룩업 테이블로 Q-러닝 에피소드를 실행하는 내부 루프
+
+    q는 평탄화된 Q 테이블(리스트 또는 memoryview), transitions는 get_flat_transitions의
+    (다음 상태 행 시작 위치, 보상, 종료 여부) 튜플 리스트로, 4개짜리 행에 대한 NumPy 호출이나
+    슬라이스 없이 파이썬 스칼라로 읽고 쓴다. GridWorld의 액션 수(4)를 전제로 풀어 쓴 루프이다.
+    난수 소비 순서와 갱신 순서는 train_agent와 같으므로 시드가 같으면 Q 테이블도 같다.
+    locks를 주면 상태 인덱스로 나눈 줄무늬 잠금 안에서 Q값을 갱신하고,
+    on_episode(에피소드, 보상, 스텝 수)는 에피소드가 끝날 때마다 호출된다.
+    반환값: (에피소드별 보상, 에피소드별 스텝 수, 마지막 엡실론)
+    """
+    episode_rewards = []
+    episode_lengths = []
+    start_base = start_index * 4
+
+    uniforms = []
+    position = 0
+
+    for episode in range(num_episodes):
+        base = start_base  # 현재 상태의 Q 테이블 행 시작 위치 (상태 인덱스 * 4)
+        done = False
+        total_reward = 0
+        steps = 0
+
+        while not done:
+            # 탐험용 난수를 블록 단위로 미리 뽑아 사용
+            if position == len(uniforms):
+                uniforms = rng.random(RANDOM_BLOCK_SIZE).tolist()
+                position = 0
+            u = uniforms[position]
+            position += 1
+
+            if u < epsilon:
+                action = min(int(u / epsilon * 4), 3)
+            else:
+                # 첫 번째 최대값 선택 (np.argmax와 동일)
+                action = 0
+                best = q[base]
+                value = q[base + 1]
+                if value > best:
+                    best = value
+                    action = 1
+                value = q[base + 2]
+                if value > best:
+                    best = value
+                    action = 2
+                if q[base + 3] > best:
+                    action = 3
+
+            index = base + action
+            next_base, reward, done = transitions[index]
+
+            # Q-러닝 업데이트 규칙
+            if done:
+                target_q = reward
+            else:
+                best = q[next_base]
+                value = q[next_base + 1]
+                if value > best:
+                    best = value
+                value = q[next_base + 2]
+                if value > best:
+                    best = value
+                value = q[next_base + 3]
+                if value > best:
+                    best = value
+                target_q = reward + discount_factor * best
+            if locks is None:
+                current_q = q[index]
+                q[index] = current_q + learning_rate * (target_q - current_q)
+            else:
+                with locks[(base >> 2) % len(locks)]:
+                    current_q = q[index]
+                    q[index] = current_q + learning_rate * (target_q - current_q)
+
+            base = next_base
+            total_reward += reward
+            steps += 1
+
+        episode_rewards.append(total_reward)
+        episode_lengths.append(steps)
+        if on_episode is not None:
+            on_episode(episode, total_reward, steps)
+
+        # train_agent와 같은 엡실론 감소 스케줄
+        if (episode + 1) % decay_interval == 0:
+            epsilon *= epsilon_decay
+
+    return episode_rewards, episode_lengths, epsilon
+
+def get_flat_transitions(env):
+    """
+    환경의 전이 테이블을 평탄화된 (상태, 액션) 인덱스 순서의 파이썬 튜플 리스트로 반환
+    각 튜플은 (다음 상태의 Q 테이블 행 시작 위치 = 다음 상태 인덱스 * 4, 보상, 종료 여부)
+    """
+    next_states, rewards, dones = env.get_transition_table()
+    return list(zip(
+        (np.asarray(next_states, dtype=np.int64).reshape(-1) * env.action_space).tolist(),
+        np.asarray(rewards, dtype=np.float64).reshape(-1).tolist(),
+        np.asarray(dones, dtype=bool).reshape(-1).tolist(),
+    ))
+
+def train_agent_fast(num_episodes=30000, env=None, seed=None, verbose=True,
+                     learning_rate=0.1, discount_factor=0.9, epsilon=0.1, epsilon_decay=0.9):
+    """
+    train_agent와 같은 결과를 내는 정수 상태 기반 고속 학습 엔진
+    반환값: (환경, 에이전트, 에피소드별 보상, 통계)
+    통계에는 에피소드별 스텝 수와 초당 환경 스텝 수가 포함된다.
+    """
+    if env is None:
+        env = GridWorld(size=5)
+    agent = QLearningAgent(env, learning_rate=learning_rate, discount_factor=discount_factor,
+                           epsilon=epsilon, seed=seed)
+
+    # 다음 상태 룩업 테이블과 Q 테이블을 평탄화된 파이썬 리스트로 준비
+    transitions = get_flat_transitions(env)
+    q = agent.q_table.reshape(-1).tolist()
+
+    start = time.perf_counter()
+    episode_rewards, episode_lengths, agent.epsilon = run_q_learning(
+        q, transitions, env.get_state_index(env.start), num_episodes,
+        agent.learning_rate, agent.discount_factor, agent.epsilon, agent.rng,
+        epsilon_decay=epsilon_decay,
+    )
+    elapsed = time.perf_counter() - start
+
+    # 학습된 Q값을 에이전트의 Q 테이블에 반영
+    agent.q_table[:] = np.asarray(q).reshape(agent.q_table.shape)
+
+    total_steps = sum(episode_lengths)
+    stats = {
+        'episode_lengths': episode_lengths,
+        'total_steps': total_steps,
+        'seconds': elapsed,
+        'steps_per_sec': total_steps / elapsed if elapsed > 0 else float('inf'),
+    }
+    if verbose:
+        print(f"{num_episodes} 에피소드, {total_steps} 스텝, {elapsed:.3f}초 ({stats['steps_per_sec']:,.0f} 스텝/초)")
+
+    return env, agent, episode_rewards, stats
+
+def main():
+    num_episodes = 5000
+    seed = 42
+
+    # 기존 학습 루프
+    start = time.perf_counter()
+    _, reference_agent, reference_rewards = train_agent(num_episodes=num_episodes, seed=seed, verbose=False)
+    reference_time = time.perf_counter() - start
+
+    # 고속 학습 엔진
+    _, agent, rewards, stats = train_agent_fast(num_episodes=num_episodes, seed=seed, verbose=False)
+
+    reference_speed = stats['total_steps'] / reference_time
+    print("=== 정수 상태 고속 학습 엔진 ===")
+    print(f"train_agent:      {reference_time:.3f}초 ({reference_speed:,.0f} 스텝/초)")
+    print(f"train_agent_fast: {stats['seconds']:.3f}초 ({stats['steps_per_sec']:,.0f} 스텝/초)")
+    print(f"속도 향상: {stats['steps_per_sec'] / reference_speed:.1f}배")
+    print(f"Q 테이블 일치: {np.array_equal(agent.q_table, reference_agent.q_table)}")
+    print(f"에피소드 보상 일치: {rewards == reference_rewards}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+import os
+import time
+import tempfile
+import multiprocessing as mp
+from multiprocessing import shared_memory
+import numpy as np
+from environment import GridWorld
+from fast_train import run_q_learning, get_flat_transitions
+from planner import value_iteration
+
+def _make_env(map_path):
+    return GridWorld(size=5) if map_path is None else GridWorld.from_file(map_path)
+
+def _greedy_path(q_table, next_states, start_index, goal_index, max_steps):
+    """공유 테이블 스냅샷의 탐욕 정책으로 시작 상태에서 따라간 경로 (목표 도달 실패 시 None)"""
+    path = [start_index]
+    state = start_index
+    while state != goal_index:
+        if len(path) > max_steps:
+            return None
+        state = next_states[state, np.argmax(q_table[state])]
+        path.append(state)
+    return path
+
+def _worker(worker_id, seed_seq, map_path, num_episodes, q_name, stats_name, num_workers,
+            learning_rate, discount_factor, epsilon, epsilon_decay, locks):
+    """
+    워커: 자신의 GridWorld 에피소드를 돌리며 공유 Q 테이블을 잠금 없이(또는 줄무늬 잠금으로) 갱신
+    에피소드가 끝날 때마다 공유 통계 배열에 (에피소드 수, 누적 보상)을 기록
+    """
+    env = _make_env(map_path)
+    transitions = get_flat_transitions(env)
+    rng = np.random.default_rng(seed_seq)
+
+    q_shm = shared_memory.SharedMemory(name=q_name)
+    stats_shm = shared_memory.SharedMemory(name=stats_name)
+    q = q_shm.buf.cast('d')
+    stats = np.ndarray((num_workers, 2), dtype=np.float64, buffer=stats_shm.buf)
+    total = [0.0]
+
+    def on_episode(episode, total_reward, steps):
+        total[0] += total_reward
+        stats[worker_id, 1] = total[0]
+        stats[worker_id, 0] = episode + 1
+
+    try:
+        run_q_learning(q, transitions, env.get_state_index(env.start), num_episodes,
+                       learning_rate, discount_factor, epsilon, rng,
+                       epsilon_decay=epsilon_decay, locks=locks, on_episode=on_episode)
+    finally:
+        del stats
+        q.release()
+        q_shm.close()
+        stats_shm.close()
+
+def train_hogwild(num_workers=4, num_episodes=5000, map_path=None, learning_rate=0.1,
+                  discount_factor=0.9, epsilon=0.1, epsilon_decay=0.9, num_lock_stripes=0,
+                  monitor_interval=0.05, stable_samples=5, seed=0, verbose=True):
+    """
+    여러 워커 프로세스가 multiprocessing.shared_memory에 놓인 Q 테이블 하나를 함께 학습
+    num_episodes는 워커당 에피소드 수, num_lock_stripes > 0이면 줄무늬 잠금 사용
+
+    부모 프로세스는 monitor_interval마다 공유 테이블을 샘플링해
+    평균 보상, 탐욕 정책이 바뀐 상태 비율, 시작점에서의 탐욕 경로 길이를 기록하고,
+    목표에 닿는 탐욕 경로의 길이가 stable_samples번 연속 같은 첫 시점을 수렴 시간으로 보고한다.
+    반환값: (환경, Q 테이블 복사본, 모니터 기록, 수렴 시간(초) 또는 None)
+    """
+    env = _make_env(map_path)
+    q_shape = (env.num_states, env.action_space)
+    active = env.get_all_state_indices()
+    next_states, _, _ = env.get_transition_table()
+    start_index, goal_index = env.get_state_index(env.start), env.get_state_index(env.goal)
+
+    q_shm = shared_memory.SharedMemory(create=True, size=int(np.prod(q_shape)) * 8)
+    stats_shm = shared_memory.SharedMemory(create=True, size=num_workers * 2 * 8)
+    q_table = np.ndarray(q_shape, dtype=np.float64, buffer=q_shm.buf)
+    stats = np.ndarray((num_workers, 2), dtype=np.float64, buffer=stats_shm.buf)
+    q_table[:] = 0.0
+    stats[:] = 0.0
+
+    locks = [mp.Lock() for _ in range(num_lock_stripes)] or None
+    seed_seqs = np.random.SeedSequence(seed).spawn(num_workers)
+    workers = [
+        mp.Process(target=_worker, args=(
+            worker_id, seed_seqs[worker_id], map_path, num_episodes, q_shm.name, stats_shm.name,
+            num_workers, learning_rate, discount_factor, epsilon, epsilon_decay, locks,
+        ))
+        for worker_id in range(num_workers)
+    ]
+
+    history = []
+    converged_time = None
+    try:
+        start = time.perf_counter()
+        for worker in workers:
+            worker.start()
+
+        previous_policy = None
+        previous_length = None
+        previous_episodes, previous_reward = 0.0, 0.0
+        stable_count = 0
+        while True:
+            running = any(worker.is_alive() for worker in workers)
+
+            # 공유 테이블 샘플링 (잠금 없이 읽으므로 갱신 중인 값이 섞일 수 있음)
+            snapshot = q_table.copy()
+            policy = np.argmax(snapshot[active], axis=1)
+            path = _greedy_path(snapshot, next_states, start_index, goal_index, len(active))
+            episodes, reward_sum = stats.sum(axis=0)
+            elapsed = time.perf_counter() - start
+
+            new_episodes = episodes - previous_episodes
+            avg_reward = (reward_sum - previous_reward) / new_episodes if new_episodes else float('nan')
+            changed = 1.0 if previous_policy is None else float(np.mean(policy != previous_policy))
+            path_length = len(path) - 1 if path is not None else -1
+            history.append({'time': elapsed, 'episodes': int(episodes), 'avg_reward': avg_reward,
+                            'policy_change': changed, 'path_length': path_length})
+
+            stable_count = stable_count + 1 if path is not None and path_length == previous_length else 0
+            if converged_time is None and stable_count >= stable_samples:
+                converged_time = history[-stable_samples - 1]['time']
+
+            if verbose:
+                print(f"{elapsed:6.2f}초 | 에피소드 {int(episodes)} | 평균 보상 {avg_reward:.3f} | "
+                      f"정책 변화 {changed:.2%} | 탐욕 경로 {path_length}")
+
+            previous_policy = policy
+            previous_length = path_length
+            previous_episodes, previous_reward = episodes, reward_sum
+            if not running:
+                break
+            time.sleep(monitor_interval)
+
+        for worker in workers:
+            worker.join()
+        result = q_table.copy()
+    finally:
+        for worker in workers:
+            if worker.is_alive():
+                worker.terminate()
+        del q_table, stats
+        q_shm.close()
+        q_shm.unlink()
+        stats_shm.close()
+        stats_shm.unlink()
+
+    return env, result, history, converged_time
+
+def main():
+    # 코어 수에 따른 정책 수렴 시간 비교 (전체 에피소드 수는 고정)
+    map_path = os.path.join(tempfile.mkdtemp(), 'hogwild_map.npy')
+    env = GridWorld.random_map(40, 40, wall_prob=0.2, seed=0)
+    env.save_walls(map_path)
+    total_episodes = 16000
+
+    # 기준: 가치 반복으로 구한 최적 경로 길이
+    optimal_q_table, _, _ = value_iteration(env)
+    next_states, _, _ = env.get_transition_table()
+    optimal_path = _greedy_path(optimal_q_table, next_states, env.get_state_index(env.start),
+                                env.get_state_index(env.goal), env.num_states)
+
+    print("=== Hogwild 병렬 Q-러닝 ===")
+    print(f"최적 경로 길이: {len(optimal_path) - 1} 스텝")
+    results = []
+    worker_counts = sorted({1, 2, 4, os.cpu_count() or 1})
+    for num_workers in worker_counts:
+        _, _, history, converged_time = train_hogwild(
+            num_workers=num_workers, num_episodes=total_episodes // num_workers,
+            map_path=map_path, verbose=False,
+        )
+        results.append((num_workers, converged_time, history[-1]))
+
+    for num_workers, converged_time, last in results:
+        converged = f"{converged_time:.2f}초" if converged_time is not None else "수렴 안 함"
+        print(f"워커 {num_workers}개: 정책 수렴 {converged}, 전체 학습 {last['time']:.2f}초, "
+              f"탐욕 경로 {last['path_length']} 스텝")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+import time
+import numpy as np
+import matplotlib.pyplot as plt
+from environment import GridWorld
+from train import train_agent
+from visualization import visualize_grid, visualize_q_values
+
+def build_model(env):
+    """
+    GridWorld의 전이 모델을 한 번만 계산
+    반환값: 다음 상태, 보상, 종료 여부 테이블과 값을 갱신할 상태 마스크
+    """
+    next_states, rewards, dones = env.get_transition_table()
+
+    # 장애물과 목표(종료 상태)는 Q-러닝에서도 갱신되지 않으므로 0으로 고정
+    active = ~np.asarray(env.walls, dtype=bool).reshape(-1)
+    active[env.get_state_index(env.goal)] = False
+    return next_states, rewards, dones, active
+
+def _q_from_values(model, values, discount_factor):
+    """상태 가치로부터 Q 테이블 계산 (벡터화된 벨만 백업)"""
+    next_states, rewards, dones, active = model
+    q_table = rewards + discount_factor * np.where(dones, 0.0, values[next_states])
+    q_table[~active] = 0.0
+    return q_table
+
+def value_iteration(env, discount_factor=0.9, theta=1e-10, max_iterations=100000):
+    """
+    가치 반복으로 최적 Q 테이블 계산
+    반환값: (Q 테이블, 상태 가치, 반복 횟수)
+    Q 테이블은 QLearningAgent.q_table과 같은 (상태 수, 액션 수) 형태
+    """
+    model = build_model(env)
+    values = np.zeros(env.num_states)
+
+    for iteration in range(1, max_iterations + 1):
+        new_values = _q_from_values(model, values, discount_factor).max(axis=1)
+        delta = np.max(np.abs(new_values - values))
+        values = new_values
+        if delta < theta:
+            break
+
+    return _q_from_values(model, values, discount_factor), values, iteration
+
+def policy_iteration(env, discount_factor=0.9, theta=1e-10, max_iterations=1000, max_eval_sweeps=10000):
+    """
+    정책 반복으로 최적 Q 테이블 계산
+    정책 평가는 고정 정책에 대한 벡터화된 반복 평가로 수행하되 최대 max_eval_sweeps번까지만 반복
+    (discount_factor=1에서 목표에 도달하지 못하는 정책은 가치가 수렴하지 않으므로, 잘린 평가로 낮아진
+    가치 때문에 다음 정책 개선에서 목표로 가는 행동으로 바뀜)
+    반환값: (Q 테이블, 상태 가치, 정책 개선 횟수)
+    """
+    model = build_model(env)
+    next_states, rewards, dones, active = model
+    num_states = env.num_states
+    states = np.arange(num_states)
+
+    policy = np.zeros(num_states, dtype=np.int64)
+    values = np.zeros(num_states)
+
+    for iteration in range(1, max_iterations + 1):
+        # 정책 평가
+        policy_next = next_states[states, policy]
+        policy_rewards = rewards[states, policy]
+        policy_dones = dones[states, policy]
+        for _ in range(max_eval_sweeps):
+            new_values = policy_rewards + discount_factor * np.where(policy_dones, 0.0, values[policy_next])
+            new_values[~active] = 0.0
+            delta = np.max(np.abs(new_values - values))
+            values = new_values
+            if delta < theta:
+                break
+
+        # 정책 개선
+        new_policy = np.argmax(_q_from_values(model, values, discount_factor), axis=1)
+        if np.array_equal(new_policy, policy):
+            break
+        policy = new_policy
+
+    return _q_from_values(model, values, discount_factor), values, iteration
+
+def get_policy(env, q_table):
+    """Q 테이블로부터 QLearningAgent.get_optimal_policy와 같은 형식의 정책 반환"""
+    policy = {}
+    for state in env.get_all_states():
+        policy[state] = np.argmax(q_table[env.get_state_index(state)])
+    return policy
+
+def policy_agreement(env, q_table, optimal_q_table, tol=1e-6):
+    """
+    학습된 Q 테이블의 탐욕 행동이 최적 Q 테이블 기준으로도 최적인 상태의 비율
+    (동점인 최적 행동이 여러 개일 수 있으므로 행동 일치 대신 Q값으로 비교)
+    """
+    _, _, _, active = build_model(env)
+    states = np.flatnonzero(active)
+    greedy = np.argmax(q_table[states], axis=1)
+    optimal_q = optimal_q_table[states]
+    is_optimal = optimal_q[np.arange(len(states)), greedy] >= optimal_q.max(axis=1) - tol
+    return np.mean(is_optimal)
+
+def main():
+    env = GridWorld(size=5)
+
+    # 샘플 기반 Q-러닝
+    start = time.perf_counter()
+    _, agent, _ = train_agent(num_episodes=500)
+    q_learning_time = time.perf_counter() - start
+
+    # 가치 반복
+    start = time.perf_counter()
+    vi_q_table, _, vi_iterations = value_iteration(env)
+    vi_time = time.perf_counter() - start
+
+    # 정책 반복
+    start = time.perf_counter()
+    pi_q_table, _, pi_iterations = policy_iteration(env)
+    pi_time = time.perf_counter() - start
+
+    print("=== 모델 기반 계획 vs 샘플 기반 Q-러닝 ===")
+    print(f"Q-러닝 (500 에피소드): {q_learning_time:.4f}초")
+    print(f"가치 반복 ({vi_iterations}회 반복): {vi_time:.4f}초")
+    print(f"정책 반복 ({pi_iterations}회 개선): {pi_time:.4f}초")
+    print(f"가치 반복 vs 정책 반복 최대 Q 차이: {np.max(np.abs(vi_q_table - pi_q_table)):.2e}")
+    print(f"Q-러닝 정책의 최적 행동 비율: {policy_agreement(env, agent.q_table, vi_q_table):.2%}")
+
+    # 기존 시각화 함수 그대로 사용
+    visualize_q_values(env, vi_q_table)
+    fig, ax = visualize_grid(env, policy=get_policy(env, vi_q_table))
+    plt.savefig('optimal_policy.png')
+    plt.show()
+
+if __name__ == "__main__":
+    main()
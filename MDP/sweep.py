@@ -0,0 +1,219 @@
+import os
+import csv
+import json
+import hashlib
+import argparse
+import itertools
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+import numpy as np
+from environment import GridWorld
+from fast_train import train_agent_fast
+from train import visualize_path
+
+# 스윕 대상 하이퍼파라미터 (train_agent_fast 인자 이름)
+PARAM_NAMES = ['learning_rate', 'discount_factor', 'epsilon', 'epsilon_decay']
+
+# 스윕 공통 조건 파일 (에피소드 수, 맵)
+MANIFEST_FILE = 'sweep.json'
+
+# 결과 테이블 열
+RESULT_FIELDS = ['config_id'] + PARAM_NAMES + ['seed', 'final_reward', 'final_steps', 'path_length']
+
+DEFAULT_GRID = {
+    'learning_rate': [0.05, 0.1, 0.3],
+    'discount_factor': [0.9, 0.99],
+    'epsilon': [0.1, 0.3],
+    'epsilon_decay': [0.9, 0.99],
+}
+
+DEFAULT_RANGES = {
+    'learning_rate': (0.01, 0.5),
+    'discount_factor': (0.8, 0.999),
+    'epsilon': (0.01, 0.5),
+    'epsilon_decay': (0.8, 1.0),
+}
+
+def make_grid_configs(param_grid, seeds):
+    """그리드 탐색용 설정 목록 생성"""
+    configs = []
+    for values in itertools.product(*(param_grid[name] for name in PARAM_NAMES)):
+        for seed in seeds:
+            configs.append(dict(zip(PARAM_NAMES, values), seed=seed))
+    return configs
+
+def make_random_configs(param_ranges, num_samples, seeds, sweep_seed=0):
+    """랜덤 탐색용 설정 목록 생성 (각 파라미터를 범위 안에서 균등 샘플링)"""
+    rng = np.random.default_rng(sweep_seed)
+    configs = []
+    for _ in range(num_samples):
+        params = {name: float(rng.uniform(*param_ranges[name])) for name in PARAM_NAMES}
+        for seed in seeds:
+            configs.append(dict(params, seed=seed))
+    return configs
+
+def get_config_id(config):
+    """설정을 식별하는 짧은 해시 (재개 시 완료 여부 판별에 사용)"""
+    key = json.dumps({name: config[name] for name in PARAM_NAMES + ['seed']}, sort_keys=True)
+    return hashlib.sha1(key.encode()).hexdigest()[:12]
+
+def get_sweep_manifest(num_episodes, map_path):
+    """모든 설정에 공통인 실험 조건 (맵은 내용의 해시로 식별하고 경로는 참고용으로 기록)"""
+    map_sha1 = None
+    if map_path is not None:
+        with open(map_path, 'rb') as f:
+            map_sha1 = hashlib.sha1(f.read()).hexdigest()
+    return {'num_episodes': num_episodes, 'map_path': map_path, 'map_sha1': map_sha1}
+
+def check_sweep_manifest(out_dir, manifest):
+    """
+    out_dir의 기존 결과가 같은 조건의 스윕인지 확인하고, 처음이면 조건 파일 기록
+    config_id는 하이퍼파라미터와 시드만으로 정해지므로, 에피소드 수나 맵이 다른 스윕을
+    같은 디렉터리에서 재개하면 다른 실험의 결과를 완료로 취급하게 된다. 이 경우 ValueError.
+    """
+    manifest_path = os.path.join(out_dir, MANIFEST_FILE)
+    if os.path.exists(manifest_path):
+        with open(manifest_path) as f:
+            saved = json.load(f)
+        if (saved['num_episodes'], saved['map_sha1']) != (manifest['num_episodes'], manifest['map_sha1']):
+            raise ValueError(f"{out_dir}의 기존 스윕 조건 {saved}이 현재 조건 {manifest}과 다릅니다. "
+                             f"다른 --out-dir을 사용하세요.")
+        return
+    if os.path.exists(os.path.join(out_dir, 'results.csv')):
+        raise ValueError(f"{out_dir}에 조건 파일 없이 결과가 있어 같은 조건인지 확인할 수 없습니다. "
+                         f"다른 --out-dir을 사용하세요.")
+    with open(manifest_path, 'w') as f:
+        json.dump(manifest, f)
+
+def load_results(results_path):
+    """이미 완료된 설정의 결과 행 읽기"""
+    if not os.path.exists(results_path):
+        return []
+    with open(results_path, newline='') as f:
+        return list(csv.DictReader(f))
+
+def _make_env(map_path):
+    return GridWorld(size=5) if map_path is None else GridWorld.from_file(map_path)
+
+def _run_config(slot, num_slots, config, num_episodes, map_path, q_name, rewards_name):
+    """
+    워커: 설정 하나를 학습하고 Q 테이블과 보상 곡선을 공유 메모리 슬롯에 기록
+    피클링으로 돌려주는 값은 작은 지표 딕셔너리뿐이다.
+    """
+    env = _make_env(map_path)
+    _, agent, episode_rewards, stats = train_agent_fast(
+        num_episodes=num_episodes, env=env, seed=config['seed'], verbose=False,
+        **{name: config[name] for name in PARAM_NAMES},
+    )
+
+    q_shm = shared_memory.SharedMemory(name=q_name)
+    rewards_shm = shared_memory.SharedMemory(name=rewards_name)
+    try:
+        q_tables = np.ndarray((num_slots,) + agent.q_table.shape, dtype=np.float64, buffer=q_shm.buf)
+        q_tables[slot] = agent.q_table
+        reward_curves = np.ndarray((num_slots, num_episodes), dtype=np.float64, buffer=rewards_shm.buf)
+        reward_curves[slot] = episode_rewards
+        del q_tables, reward_curves
+    finally:
+        q_shm.close()
+        rewards_shm.close()
+
+    # 탐욕 정책의 최적 경로 길이 (목표에 도달하지 못하면 -1)
+    path = visualize_path(env, agent, max_steps=env.num_states)
+    path_length = len(path) - 1 if path[-1] == env.goal else -1
+
+    return {
+        'final_reward': float(np.mean(episode_rewards[-100:])),
+        'final_steps': float(np.mean(stats['episode_lengths'][-100:])),
+        'path_length': path_length,
+    }
+
+def run_sweep(configs, num_episodes=500, out_dir='sweep_results', max_workers=None, map_path=None):
+    """
+    설정 목록을 프로세스 풀에서 병렬로 학습하고 결과 테이블 반환
+    out_dir/results.csv에 이미 기록된 설정은 건너뛰므로 중단된 스윕을 그대로 재개할 수 있다.
+    (out_dir/sweep.json의 에피소드 수와 맵이 현재와 다르면 재개하지 않고 ValueError)
+    각 설정의 Q 테이블과 보상 곡선은 out_dir/<config_id>.npz로 저장된다.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    check_sweep_manifest(out_dir, get_sweep_manifest(num_episodes, map_path))
+    results_path = os.path.join(out_dir, 'results.csv')
+    finished = {row['config_id'] for row in load_results(results_path)}
+    pending = [config for config in configs if get_config_id(config) not in finished]
+    print(f"전체 설정 {len(configs)}개 중 완료 {len(configs) - len(pending)}개, 남은 설정 {len(pending)}개")
+
+    if pending:
+        env = _make_env(map_path)
+        q_shape = (len(pending), env.num_states, env.action_space)
+        rewards_shape = (len(pending), num_episodes)
+
+        # 워커가 결과를 기록할 공유 메모리
+        q_shm = shared_memory.SharedMemory(create=True, size=int(np.prod(q_shape)) * 8)
+        rewards_shm = shared_memory.SharedMemory(create=True, size=int(np.prod(rewards_shape)) * 8)
+        q_tables = np.ndarray(q_shape, dtype=np.float64, buffer=q_shm.buf)
+        reward_curves = np.ndarray(rewards_shape, dtype=np.float64, buffer=rewards_shm.buf)
+
+        write_header = not os.path.exists(results_path)
+        try:
+            with open(results_path, 'a', newline='') as f, \
+                    ProcessPoolExecutor(max_workers=max_workers or os.cpu_count()) as executor:
+                writer = csv.DictWriter(f, fieldnames=RESULT_FIELDS)
+                if write_header:
+                    writer.writeheader()
+
+                futures = {
+                    executor.submit(_run_config, slot, len(pending), config, num_episodes, map_path,
+                                    q_shm.name, rewards_shm.name): slot
+                    for slot, config in enumerate(pending)
+                }
+                for done_count, future in enumerate(as_completed(futures), 1):
+                    slot = futures[future]
+                    config = pending[slot]
+                    config_id = get_config_id(config)
+
+                    # 결과 파일을 먼저 저장한 뒤 완료 행을 기록
+                    np.savez(os.path.join(out_dir, f"{config_id}.npz"),
+                             q_table=q_tables[slot], rewards=reward_curves[slot])
+                    writer.writerow(dict(config, config_id=config_id, **future.result()))
+                    f.flush()
+                    print(f"[{done_count}/{len(pending)}] {config_id} 완료")
+        finally:
+            del q_tables, reward_curves
+            q_shm.close()
+            q_shm.unlink()
+            rewards_shm.close()
+            rewards_shm.unlink()
+
+    # 이번 스윕 설정의 결과만 모아 반환
+    config_ids = {get_config_id(config) for config in configs}
+    return [row for row in load_results(results_path) if row['config_id'] in config_ids]
+
+def print_results(rows, top=10):
+    """최종 보상 기준 상위 결과 출력"""
+    rows = sorted(rows, key=lambda row: float(row['final_reward']), reverse=True)
+    print(" | ".join(RESULT_FIELDS[1:]))
+    for row in rows[:top]:
+        print(" | ".join(f"{float(row[name]):.4g}" for name in RESULT_FIELDS[1:]))
+
+def main():
+    parser = argparse.ArgumentParser(description="GridWorld Q-러닝 하이퍼파라미터 스윕")
+    parser.add_argument('--mode', choices=['grid', 'random'], default='grid')
+    parser.add_argument('--num-samples', type=int, default=20, help="랜덤 탐색 샘플 수")
+    parser.add_argument('--seeds', type=int, nargs='+', default=[0, 1, 2])
+    parser.add_argument('--num-episodes', type=int, default=500)
+    parser.add_argument('--workers', type=int, default=None, help="기본값: 모든 코어")
+    parser.add_argument('--out-dir', default='sweep_results')
+    parser.add_argument('--map', default=None, help="맵 파일 (텍스트 또는 .npy)")
+    args = parser.parse_args()
+
+    if args.mode == 'grid':
+        configs = make_grid_configs(DEFAULT_GRID, args.seeds)
+    else:
+        configs = make_random_configs(DEFAULT_RANGES, args.num_samples, args.seeds)
+
+    rows = run_sweep(configs, num_episodes=args.num_episodes, out_dir=args.out_dir,
+                     max_workers=args.workers, map_path=args.map)
+    print_results(rows)
+
+if __name__ == "__main__":
+    main()
@@ -1,23 +1,68 @@
 import os
 import numpy as np
 import matplotlib.pyplot as plt
-from environment import GridWorld
+from environment import GridWorld, BatchGridWorld
 from agent import QLearningAgent
+from checkpoint import open_q_table_memmap, save_checkpoint, has_checkpoint, restore_agent
 from visualization import visualize_grid, plot_rewards, visualize_q_values
 
-def train_agent(num_episodes=30000):
-    # 환경 및 에이전트 생성
-    env = GridWorld(size=5)
-    agent = QLearningAgent(env, learning_rate=0.1, discount_factor=0.9, epsilon=0.1)
+def train_agent(num_episodes=30000, env=None, seed=None, verbose=True,
+                learning_rate=0.1, discount_factor=0.9, epsilon=0.1, epsilon_decay=0.9,
+                agent=None, stop_condition=None,
+                checkpoint_dir=None, checkpoint_interval=1000, resume=False, mmap_q_table=False,
+                recorder=None):
+    """
+    Q-러닝 학습 루프
+    checkpoint_dir를 주면 checkpoint_interval 에피소드마다(그리고 Ctrl-C로 중단될 때) 체크포인트를 저장하고,
+    resume=True면 최신 체크포인트부터 이어서 학습한다.
+    mmap_q_table=True면 Q 테이블 자체를 체크포인트 디렉터리의 메모리 맵 파일에 두고 학습한다.
+    recorder를 주면 에피소드마다 recorder.add_episode(state=, action=, reward=, next_state=, done=)로
+    전이를 기록한다 (상태는 정수 인덱스, 예: MC/episode_store.py의 EpisodeRecorder와 GRID_WORLD_COLUMNS).
+    """
+    # 환경 및 에이전트 생성 (에이전트를 주면 그 환경을, 환경도 없으면 기본 5x5 맵 사용)
+    if agent is not None:
+        env = agent.env
+    else:
+        if env is None:
+            env = GridWorld(size=5)
+        q_table = None
+        if checkpoint_dir is not None and mmap_q_table:
+            q_table = open_q_table_memmap(checkpoint_dir, (env.num_states, env.action_space), resume=resume)
+        agent = QLearningAgent(env, learning_rate=learning_rate, discount_factor=discount_factor,
+                               epsilon=epsilon, seed=seed, q_table=q_table)
     
-    # 학습 로그 저장
+    # 학습 로그 저장 (체크포인트에서 재개하면 이어서 기록)
     episode_rewards = []
+    start_episode = 0
+    if resume and has_checkpoint(checkpoint_dir):
+        start_episode, episode_rewards = restore_agent(agent, checkpoint_dir)
+        if verbose:
+            print(f"체크포인트에서 재개: 에피소드 {start_episode}부터")
+    
+    try:
+        _run_episodes(env, agent, start_episode, num_episodes, episode_rewards, verbose,
+                      epsilon_decay, stop_condition, checkpoint_dir, checkpoint_interval, recorder)
+    except KeyboardInterrupt:
+        # 중단 시점까지 완료한 에피소드로 체크포인트 저장 (진행 중이던 에피소드의 갱신은 Q 테이블에 남음)
+        if checkpoint_dir is not None:
+            save_checkpoint(checkpoint_dir, agent, len(episode_rewards), episode_rewards)
+            print(f"중단됨: 에피소드 {len(episode_rewards)}까지 체크포인트 저장")
+        raise
     
-    for episode in range(num_episodes):
+    if checkpoint_dir is not None:
+        save_checkpoint(checkpoint_dir, agent, len(episode_rewards), episode_rewards)
+    
+    return env, agent, episode_rewards
+
+def _run_episodes(env, agent, start_episode, num_episodes, episode_rewards, verbose,
+                  epsilon_decay, stop_condition, checkpoint_dir, checkpoint_interval, recorder=None):
+    """train_agent의 에피소드 루프 (episode_rewards에 이어서 기록)"""
+    for episode in range(start_episode, num_episodes):
         # 환경 초기화
         state = env.reset()
         done = False
         total_reward = 0
+        transitions = []
         
         # 에피소드 실행
         while not done:
@@ -29,6 +74,8 @@ def train_agent(num_episodes=30000):
             
             # 에이전트 학습
             agent.learn(state, action, reward, next_state, done)
+            if recorder is not None:
+                transitions.append((env.get_state_index(state), action, reward, env.get_state_index(next_state), done))
             
             # 상태 업데이트
             state = next_state
@@ -36,24 +83,90 @@ def train_agent(num_episodes=30000):
         
         # 에피소드 로그 저장
         episode_rewards.append(total_reward)
+        if recorder is not None:
+            states, actions, rewards, next_states, dones = zip(*transitions)
+            recorder.add_episode(state=states, action=actions, reward=rewards, next_state=next_states, done=dones)
         
         # 학습 진행 출력
         if (episode + 1) % 100 == 0:
-            print(f"에피소드 {episode + 1}/{num_episodes}, 평균 보상: {np.mean(episode_rewards[-100:]):.2f}")
+            if verbose:
+                print(f"에피소드 {episode + 1}/{num_episodes}, 평균 보상: {np.mean(episode_rewards[-100:]):.2f}")
             # 중간 학습 결과 시각화를 위해 엡실론 감소
-            agent.epsilon *= 0.9
+            agent.epsilon *= epsilon_decay
+        
+        # 주기적 체크포인트 저장
+        if checkpoint_dir is not None and (episode + 1) % checkpoint_interval == 0:
+            save_checkpoint(checkpoint_dir, agent, episode + 1, episode_rewards)
+        
+        # 조기 종료 조건 (예: 탐욕 정책이 최적 경로에 도달)
+        if stop_condition is not None and stop_condition(env, agent):
+            break
+
+def train_agent_batch(num_envs=1000, num_steps=1000, size=5, seed=None, map_path=None):
+    """
+    BatchGridWorld로 N개의 환경을 동시에 진행하며 배치 Q-러닝 학습
+    엡실론은 train_agent와 같이 완료된 에피소드 100개마다 감소
+    map_path를 주면 맵 파일(텍스트 또는 .npy)에서 환경을 생성
+    """
+    if map_path is None:
+        env = BatchGridWorld(num_envs, size=size)
+    else:
+        env = BatchGridWorld.from_file(map_path, num_envs=num_envs)
+    agent = QLearningAgent(env, learning_rate=0.1, discount_factor=0.9, epsilon=0.1, seed=seed)
+    
+    # 완료된 에피소드의 총 보상 기록
+    episode_rewards = []
+    running_rewards = np.zeros(num_envs)
+    
+    states = env.reset()
+    for step in range(num_steps):
+        actions = agent.select_action_batch(states)
+        next_states, rewards, dones = env.step(actions)
+        agent.learn_batch(states, actions, rewards, next_states, dones)
+        
+        # 완료된 에피소드 보상 기록
+        running_rewards += rewards
+        num_before = len(episode_rewards)
+        episode_rewards.extend(running_rewards[dones].tolist())
+        running_rewards[dones] = 0
+        
+        # 완료된 에피소드 100개마다 엡실론 감소
+        num_decays = len(episode_rewards) // 100 - num_before // 100
+        agent.epsilon *= 0.9 ** num_decays
+        
+        states = next_states
+        
+        if (step + 1) % 100 == 0:
+            print(f"스텝 {step + 1}/{num_steps}, 완료 에피소드: {len(episode_rewards)}, 평균 보상: {np.mean(episode_rewards[-100:]) if episode_rewards else 0:.2f}")
     
     return env, agent, episode_rewards
 
-def visualize_path(env, agent):
+def replay_episodes(agent, reader, num_passes=1, chunk_episodes=10000):
+    """
+    저장된 GridWorld 전이를 디스크에서 묶음 단위로 읽어 에이전트를 학습 (환경 상호작용 없음)
+    reader는 iter_chunks(chunk_episodes)로 (열 딕셔너리, 에피소드 길이)를 생성하는 객체이며
+    (예: MC/episode_store.py의 EpisodeReader), 열은 train_agent(recorder=...)가 기록한 형식이다.
+    """
+    env = agent.env
+    for _ in range(num_passes):
+        for columns, _ in reader.iter_chunks(chunk_episodes):
+            for state_idx, action, reward, next_state_idx, done in zip(
+                    columns['state'].tolist(), columns['action'].tolist(), columns['reward'].tolist(),
+                    columns['next_state'].tolist(), columns['done'].tolist()):
+                agent.learn(env.get_state_from_index(state_idx), action, reward,
+                            env.get_state_from_index(next_state_idx), done)
+    return agent
+
+def visualize_path(env, agent, max_steps=None):
     """
     최적 경로 추적 및 시각화
+    max_steps를 주면 탐욕 정책이 순환하더라도 그 스텝 수에서 멈춤
     """
     state = env.reset()
     path = [state]
     done = False
     
-    while not done:
+    while not done and (max_steps is None or len(path) <= max_steps):
         action = np.argmax(agent.q_table[env.get_state_index(state)])  # 최적 행동 선택
         next_state, _, done = env.step(action)
         path.append(next_state)
@@ -68,7 +181,7 @@ def main():
     
     # 학습 결과 출력
     print("학습 완료!")
-    print(f"최종 Q-테이블:\n{agent.q_table.reshape(env.size, env.size, env.action_space)}")
+    print(f"최종 Q-테이블:\n{agent.q_table.reshape(env.height, env.width, env.action_space)}")
     
     # 최적 정책 추출
     optimal_policy = agent.get_optimal_policy()
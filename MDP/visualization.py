@@ -2,56 +2,76 @@ import matplotlib.pyplot as plt
 import numpy as np
 import seaborn as sns
 
-def visualize_grid(env, q_table=None, policy=None):
+# 액션별 화살표 벡터 (몸통 0.3 + 머리 0.1, y축을 뒤집어 행 0이 위에 오므로 위쪽은 음수): 위, 오른쪽, 아래, 왼쪽
+ARROW_DX = np.array([0.0, 0.4, 0.0, -0.4])
+ARROW_DY = np.array([-0.4, 0.0, 0.4, 0.0])
+
+def _policy_to_array(env, policy):
+    """딕셔너리 정책을 (높이, 너비) 행동 배열로 변환 (정책이 없는 칸은 -1)"""
+    if isinstance(policy, dict):
+        policy_array = np.full((env.height, env.width), -1, dtype=np.int64)
+        for (x, y), action in policy.items():
+            policy_array[x, y] = action
+        return policy_array
+    return np.asarray(policy).reshape(env.height, env.width)
+
+def _walls_at(env, xs, ys):
+    """좌표 배열 위치의 장애물 여부"""
+    return np.asarray(env.walls[xs, ys], dtype=bool)
+
+def _get_stride(env, max_cells):
+    """한 변에 최대 max_cells칸만 그리도록 하는 다운샘플링 간격"""
+    return max(1, int(np.ceil(max(env.height, env.width) / max_cells)))
+
+def visualize_grid(env, q_table=None, policy=None, max_pixels=1000, max_arrows=50):
     """
     GridWorld와 학습된 Q-값 또는 정책을 시각화
+    장애물은 이미지 한 장, 정책 화살표는 quiver 한 번으로 그리며
+    큰 맵은 한 변에 max_pixels(이미지), max_arrows(화살표)칸만 남도록 다운샘플링
+    policy는 get_optimal_policy()의 딕셔너리 또는 get_policy_array()의 배열
     """
     fig, ax = plt.subplots(figsize=(5, 5))
+    height, width = env.height, env.width
     
-    # 격자 생성
-    for i in range(env.size + 1):
-        ax.axhline(i, color='black', lw=1)
-        ax.axvline(i, color='black', lw=1)
+    # 장애물 이미지 (흰 바탕에 회색 벽)
+    stride = _get_stride(env, max_pixels)
+    walls = np.asarray(env.walls[::stride, ::stride], dtype=bool)
+    image = np.full(walls.shape + (3,), 255, dtype=np.uint8)
+    image[walls] = 128
+    ax.imshow(image, extent=(0, width, height, 0), interpolation='nearest')
     
-    # 장애물 표시
-    for obstacle in env.obstacles:
-        x, y = obstacle
-        ax.add_patch(plt.Rectangle((y, env.size - x - 1), 1, 1, fill=True, color='gray'))
+    # 격자 생성 (작은 맵만)
+    if height <= max_arrows and width <= max_arrows:
+        ax.hlines(np.arange(height + 1), 0, width, color='black', lw=1)
+        ax.vlines(np.arange(width + 1), 0, height, color='black', lw=1)
     
     # 시작점과 목표점 표시
     start_x, start_y = env.start
     goal_x, goal_y = env.goal
-    ax.add_patch(plt.Rectangle((start_y, env.size - start_x - 1), 1, 1, fill=True, color='lightblue', alpha=0.5))
-    ax.add_patch(plt.Rectangle((goal_y, env.size - goal_x - 1), 1, 1, fill=True, color='green', alpha=0.5))
+    ax.add_patch(plt.Rectangle((start_y, start_x), 1, 1, fill=True, color='lightblue', alpha=0.5))
+    ax.add_patch(plt.Rectangle((goal_y, goal_x), 1, 1, fill=True, color='green', alpha=0.5))
     
-    ax.text(start_y + 0.5, env.size - start_x - 0.5, 'S', fontsize=20, ha='center', va='center')
-    ax.text(goal_y + 0.5, env.size - goal_x - 0.5, 'G', fontsize=20, ha='center', va='center')
+    ax.text(start_y + 0.5, start_x + 0.5, 'S', fontsize=20, ha='center', va='center')
+    ax.text(goal_y + 0.5, goal_x + 0.5, 'G', fontsize=20, ha='center', va='center')
     
-    # 정책 표시 (화살표로)
-    if policy:
-        for state, action in policy.items():
-            if state != env.goal:
-                x, y = state
-                # 플롯 좌표로 변환
-                plot_x = y + 0.5
-                plot_y = env.size - x - 0.5
-                
-                # 화살표 방향 (그리드월드의 좌표계에 맞춰 수정)
-                if action == 0:  # 위
-                    dx, dy = 0, 0.3  # 그래프에서는 위쪽으로 이동
-                elif action == 1:  # 오른쪽
-                    dx, dy = 0.3, 0  # 그래프에서는 오른쪽으로 이동
-                elif action == 2:  # 아래
-                    dx, dy = 0, -0.3  # 그래프에서는 아래쪽으로 이동
-                else:  # 왼쪽
-                    dx, dy = -0.3, 0  # 그래프에서는 왼쪽으로 이동
-                
-                ax.arrow(plot_x, plot_y, dx, dy, head_width=0.1, head_length=0.1, fc='black', ec='black')
+    # 정책 표시 (화살표를 quiver 한 번으로)
+    if policy is not None and len(policy):
+        stride = _get_stride(env, max_arrows)
+        actions = _policy_to_array(env, policy)[::stride, ::stride]
+        xs, ys = np.meshgrid(np.arange(0, height, stride), np.arange(0, width, stride), indexing='ij')
+        
+        # 장애물, 목표, 정책이 없는 칸 제외
+        mask = (actions >= 0) & ~_walls_at(env, xs, ys) & ~((xs == goal_x) & (ys == goal_y))
+        actions = actions[mask]
+        ax.quiver(ys[mask] + 0.5, xs[mask] + 0.5, ARROW_DX[actions] * stride, ARROW_DY[actions] * stride,
+                  angles='xy', scale_units='xy', scale=1, units='xy', width=0.02 * stride,
+                  headwidth=5, headlength=5, headaxislength=5, color='black')
     
-    plt.xlim(0, env.size)
-    plt.ylim(0, env.size)
-    plt.xticks(np.arange(0.5, env.size, 1), range(env.size))
-    plt.yticks(np.arange(0.5, env.size, 1), range(env.size-1, -1, -1))
+    plt.xlim(0, width)
+    plt.ylim(height, 0)
+    if height <= max_arrows and width <= max_arrows:
+        plt.xticks(np.arange(0.5, width, 1), range(width))
+        plt.yticks(np.arange(0.5, height, 1), range(height))
     plt.grid(False)
     plt.title('GridWorld with Optimal Policy')
     
@@ -69,26 +89,27 @@ def plot_rewards(rewards):
     plt.savefig('rewards.png')
     plt.close()
 
-def visualize_q_values(env, q_table):
+def visualize_q_values(env, q_table, max_annotated=20, max_pixels=1000):
     """
     학습된 Q-값을 히트맵으로 시각화
+    작은 맵은 값이 적힌 seaborn 히트맵, 큰 맵은 한 변 max_pixels칸으로 다운샘플링한 이미지 한 장
     """
     # 각 상태의 최대 Q값을 추출
-    max_q_values = np.zeros((env.size, env.size))
-    
-    for x in range(env.size):
-        for y in range(env.size):
-            state_idx = env.get_state_index((x, y))
-            max_q = np.max(q_table[state_idx])
-            max_q_values[x, y] = max_q
+    max_q_values = np.max(q_table, axis=1).reshape(env.height, env.width)
     
-    # 장애물에는 낮은 값 할당
-    for obstacle in env.obstacles:
-        x, y = obstacle
-        max_q_values[x, y] = np.min(max_q_values) - 1
+    # 장애물에는 낮은 값 할당 (작은 맵은 기존처럼 장애물마다 그때까지의 최솟값 - 1, 즉 k번째 장애물은 최솟값 - k)
+    walls = np.asarray(env.walls, dtype=bool)
     
     plt.figure(figsize=(10, 8))
-    sns.heatmap(max_q_values, annot=True, cmap='viridis', fmt='.2f')
+    if env.height <= max_annotated and env.width <= max_annotated:
+        max_q_values[walls] = np.min(max_q_values) - np.arange(1, np.count_nonzero(walls) + 1)
+        sns.heatmap(max_q_values, annot=True, cmap='viridis', fmt='.2f')
+    else:
+        max_q_values[walls] = np.min(max_q_values) - 1
+        stride = _get_stride(env, max_pixels)
+        plt.imshow(max_q_values[::stride, ::stride], cmap='viridis', interpolation='nearest',
+                   extent=(0, env.width, env.height, 0))
+        plt.colorbar()
     plt.title('Max Q-Values for Each State')
     plt.savefig('q_values.png')
     plt.close()
\ No newline at end of file
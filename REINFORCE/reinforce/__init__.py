@@ -0,0 +1,11 @@
+"""
+REINFORCE (CartPole-v1) 학습 패키지
+노트북(RF-practice.ipynb)과 명령줄(python -m reinforce)에서 함께 사용한다.
+"""
+from .networks import PolicyNetwork, NumpyPolicy, ValueNetwork
+from .cartpole_env import CartPoleEnv, BatchCartPoleEnv, check_gymnasium_parity
+from .checkpoint import save_checkpoint, load_checkpoint, has_checkpoint, load_policy
+from .train import (CONFIG_KEYS, configure_threads, make_env, discount_returns, gae_advantages,
+                    reinforce_update, train_reinforce, test_agent)
+from .batch import make_vector_env, train_reinforce_batch
+from .actor_learner import SharedRolloutBuffer, SharedWeights, run_actor, wait_for_slot, train_actor_learner
@@ -0,0 +1,75 @@
+import json
+import argparse
+from .checkpoint import load_checkpoint, has_checkpoint, load_policy
+from .train import CONFIG_KEYS, configure_threads, make_env, train_reinforce, test_agent
+
+def _add_thread_arguments(parser):
+    parser.add_argument('--threads', type=int, default=1,
+                        help="torch 연산 스레드 수 (기본값 1: 작은 네트워크라 여러 학습을 나란히 띄우는 편이 빠름)")
+    parser.add_argument('--interop-threads', type=int, default=1, help="torch 인터옵 스레드 수")
+    parser.add_argument('--local-env', action='store_true', help="gymnasium 대신 로컬 NumPy CartPole 사용")
+
+def load_config(args):
+    """
+    학습 설정 구성: 설정 파일(--config JSON) < 재개할 체크포인트의 설정 < 명령줄에서 직접 준 값
+    키는 train_reinforce 인자 이름 (CONFIG_KEYS와 num_episodes)
+    """
+    config = {}
+    if args.config is not None:
+        with open(args.config) as f:
+            config.update(json.load(f))
+    if args.resume and has_checkpoint(args.checkpoint_dir):
+        config.update(load_checkpoint(args.checkpoint_dir)['config'])
+    for key in CONFIG_KEYS + ['num_episodes']:
+        if getattr(args, key) is not None:
+            config[key] = getattr(args, key)
+    unknown = set(config) - set(CONFIG_KEYS) - {'num_episodes'}
+    if unknown:
+        raise ValueError(f"알 수 없는 설정 키: {sorted(unknown)}")
+    return config
+
+def main():
+    parser = argparse.ArgumentParser(prog='python -m reinforce', description="CartPole-v1 REINFORCE 학습/테스트")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    train_parser = subparsers.add_parser('train', help="학습 (체크포인트 저장/재개)")
+    train_parser.add_argument('--config', default=None, help="학습 설정 JSON 파일")
+    train_parser.add_argument('--num-episodes', dest='num_episodes', type=int, default=None)
+    train_parser.add_argument('--gamma', type=float, default=None)
+    train_parser.add_argument('--lr', type=float, default=None)
+    train_parser.add_argument('--hidden-dim', dest='hidden_dim', type=int, default=None)
+    train_parser.add_argument('--numpy-rollout', dest='numpy_rollout', action='store_true', default=None)
+    train_parser.add_argument('--advantage', choices=['returns', 'baseline', 'gae'], default=None)
+    train_parser.add_argument('--gae-lambda', dest='gae_lambda', type=float, default=None)
+    train_parser.add_argument('--entropy-coef', dest='entropy_coef', type=float, default=None)
+    train_parser.add_argument('--value-lr', dest='value_lr', type=float, default=None)
+    train_parser.add_argument('--value-steps', dest='value_steps', type=int, default=None)
+    train_parser.add_argument('--seed', type=int, default=None)
+    train_parser.add_argument('--checkpoint-dir', default=None)
+    train_parser.add_argument('--checkpoint-interval', type=int, default=100, help="체크포인트 저장 주기 (에피소드)")
+    train_parser.add_argument('--resume', action='store_true', help="체크포인트에서 이어서 학습")
+    train_parser.add_argument('--quiet', action='store_true')
+    _add_thread_arguments(train_parser)
+
+    test_parser = subparsers.add_parser('test', help="체크포인트의 정책으로 테스트 에피소드 실행")
+    test_parser.add_argument('checkpoint_dir')
+    test_parser.add_argument('--episodes', type=int, default=3)
+    test_parser.add_argument('--render', action='store_true')
+    _add_thread_arguments(test_parser)
+
+    args = parser.parse_args()
+    configure_threads(args.threads, args.interop_threads)
+    env = make_env(local=args.local_env)
+
+    if args.command == 'train':
+        config = load_config(args)
+        _, rewards_history = train_reinforce(env=env, verbose=not args.quiet, checkpoint_dir=args.checkpoint_dir,
+                                             checkpoint_interval=args.checkpoint_interval, resume=args.resume,
+                                             **config)
+        print(f"학습 종료: 에피소드 {len(rewards_history)}개, 최근 100 에피소드 평균 보상 "
+              f"{sum(rewards_history[-100:]) / max(len(rewards_history[-100:]), 1):.2f}")
+    else:
+        test_agent(load_policy(args.checkpoint_dir, env), env, num_episodes=args.episodes, render=args.render)
+
+if __name__ == "__main__":
+    main()
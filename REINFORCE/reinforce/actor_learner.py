@@ -0,0 +1,217 @@
+import time
+import queue
+import multiprocessing as mp
+from collections import deque
+import numpy as np
+import torch
+import torch.nn as nn
+import torch.optim as optim
+import torch.nn.functional as F
+from .networks import PolicyNetwork
+from .batch import make_vector_env
+from .train import discount_returns
+
+def shared_array(ctx, shape, dtype):
+    # 프로세스 간 공유 메모리(RawArray) 위의 NumPy 배열 (fork 후 액터와 러너가 같은 메모리를 봄)
+    dtype = np.dtype(dtype)
+    raw = ctx.RawArray('b', int(np.prod(shape)) * dtype.itemsize)
+    return np.frombuffer(raw, dtype=dtype).reshape(shape)
+
+class SharedRolloutBuffer:
+    """
+    액터 -> 러너 궤적 전달용 공유 메모리 링 버퍼 (슬롯 하나 = 액터의 배치 롤아웃 한 번)
+    큐로는 슬롯 번호만 주고받고 (free: 비어 있는 슬롯, full: 채워진 슬롯), 궤적 데이터는 공유 배열에 직접 쓴다.
+    """
+    def __init__(self, ctx, num_slots, max_steps, num_envs, obs_dim):
+        shape = (num_slots, max_steps, num_envs)
+        self.states = shared_array(ctx, shape + (obs_dim,), np.float32)
+        self.actions = shared_array(ctx, shape, np.int64)
+        self.behavior_log_probs = shared_array(ctx, shape, np.float32)
+        self.rewards = shared_array(ctx, shape, np.float32)
+        self.masks = shared_array(ctx, shape, np.bool_)
+        self.steps = shared_array(ctx, (num_slots,), np.int64)
+        self.versions = shared_array(ctx, (num_slots,), np.int64)  # 롤아웃에 쓴 가중치 버전
+        self.free = ctx.Queue()
+        self.full = ctx.Queue()
+        for slot in range(num_slots):
+            self.free.put(slot)
+
+class SharedWeights:
+    """러너가 정책 가중치를 방송하는 공유 배열 (버전이 바뀌었을 때만 액터가 복사)"""
+    def __init__(self, ctx, policy):
+        num_params = sum(p.numel() for p in policy.parameters())
+        self.array = shared_array(ctx, (num_params,), np.float32)
+        self.version = ctx.Value('q', -1, lock=False)
+        self.lock = ctx.Lock()
+
+    def publish(self, policy, version):
+        with self.lock:
+            self.array[:] = nn.utils.parameters_to_vector(policy.parameters()).detach().numpy()
+            self.version.value = version
+
+    def load(self, policy, known_version):
+        # 새 버전이 없으면 그대로, 있으면 가중치를 복사하고 새 버전 번호 반환
+        if self.version.value == known_version:
+            return known_version
+        with self.lock:
+            vector = torch.from_numpy(self.array.copy())
+            version = self.version.value
+        nn.utils.vector_to_parameters(vector, policy.parameters())
+        return version
+
+def run_actor(actor_id, policy, weights, buffer, make_env, num_envs, seed, stop_event):
+    """액터 프로세스: 최근 방송된 가중치로 환경을 진행해 빈 슬롯에 궤적(상태, 행동, 보상, 행동 정책 로그 확률) 기록"""
+    torch.set_num_threads(1)
+    vec_env = make_env(num_envs)
+    generator = torch.Generator().manual_seed(seed + actor_id)
+    version = None
+    first = True
+    while not stop_event.is_set():
+        try:
+            slot = buffer.free.get(timeout=0.1)
+        except queue.Empty:
+            continue
+        version = weights.load(policy, version)
+
+        states, _ = vec_env.reset(seed=seed + actor_id if first else None)
+        first = False
+        active = np.ones(num_envs, dtype=bool)
+        steps = 0
+        with torch.inference_mode():
+            while active.any():
+                log_probs = F.log_softmax(policy.logits(torch.as_tensor(states, dtype=torch.float32)), dim=-1)
+                actions = torch.multinomial(log_probs.exp(), 1, generator=generator).squeeze(1)
+                buffer.states[slot, steps] = states
+                buffer.actions[slot, steps] = actions.numpy()
+                buffer.behavior_log_probs[slot, steps] = log_probs.gather(1, actions.unsqueeze(1)).squeeze(1).numpy()
+
+                states, reward, terminated, truncated, _ = vec_env.step(actions.numpy())
+                buffer.rewards[slot, steps] = reward * active
+                buffer.masks[slot, steps] = active
+                active &= ~(terminated | truncated)
+                steps += 1
+        buffer.steps[slot] = steps
+        buffer.versions[slot] = version
+        buffer.full.put(slot)
+    vec_env.close()
+
+def wait_for_slot(buffer, actors, timeout=1.0):
+    """채워진 슬롯 번호를 기다리되, 비정상 종료한 액터가 있으면 RuntimeError (러너가 무한정 멈추지 않도록)"""
+    while True:
+        failed = {actor.name: actor.exitcode for actor in actors if actor.exitcode not in (None, 0)}
+        if failed:
+            raise RuntimeError(f"액터 프로세스가 비정상 종료했습니다 (종료 코드: {failed})")
+        try:
+            return buffer.full.get(timeout=timeout)
+        except queue.Empty:
+            continue
+
+def train_actor_learner(num_actors=2, envs_per_actor=16, num_updates=300, gamma=0.99, lr=0.01, seed=42,
+                        broadcast_interval=1, max_ratio=1.0, slots_per_actor=2, make_env=make_vector_env,
+                        hidden_dim=128, verbose=True):
+    """
+    액터 프로세스 num_actors개가 각자 envs_per_actor개 환경을 진행해 공유 메모리 링 버퍼로 궤적을 보내고,
+    현재 프로세스(러너)는 채워진 슬롯 하나마다 배치 업데이트, broadcast_interval번 업데이트마다 가중치를 방송
+    액터의 가중치는 러너보다 뒤처질 수 있으므로 스텝별 중요도 비율 π/μ를 max_ratio로 잘라 곱해 보정
+    관측/행동 크기는 make_env가 만든 벡터 환경의 공간에서 읽음
+    (fork 컨텍스트를 사용하므로 리눅스/macOS 전용, make_env에 람다 등 피클링할 수 없는 함수도 줄 수 있음)
+    반환값: train_reinforce_batch와 같은 (정책, 에피소드 보상 기록, 통계) + 통계의 평균 정책 지연(업데이트 수)
+    """
+    ctx = mp.get_context('fork')
+
+    # 환경 하나로 관측/행동 크기와 에피소드 최대 길이 확인
+    probe_env = make_env(1)
+    input_dim = probe_env.single_observation_space.shape[0]
+    output_dim = probe_env.single_action_space.n
+    max_steps = probe_env.spec.max_episode_steps
+    probe_env.close()
+
+    policy = PolicyNetwork(input_dim, output_dim, hidden_dim)
+    optimizer = optim.Adam(policy.parameters(), lr=lr)
+
+    # 공유 버퍼와 가중치 (액터마다 슬롯 slots_per_actor개 분량의 링)
+    buffer = SharedRolloutBuffer(ctx, num_actors * slots_per_actor, max_steps, envs_per_actor, input_dim)
+    weights = SharedWeights(ctx, policy)
+    weights.publish(policy, version=0)
+
+    # 결과 기록용
+    rewards_history = []
+    running_reward = deque(maxlen=100)
+    total_steps = 0
+    total_lag = 0
+    num_completed = 0
+    solved_time = None
+    start = time.perf_counter()
+
+    # 액터 시작 (액터 쪽 정책 복사본은 fork 시 각 프로세스로 복제됨)
+    stop_event = ctx.Event()
+    actor_policy = PolicyNetwork(input_dim, output_dim, hidden_dim)
+    actors = [ctx.Process(target=run_actor, daemon=True,
+                          args=(actor_id, actor_policy, weights, buffer, make_env, envs_per_actor, seed, stop_event))
+              for actor_id in range(num_actors)]
+    for actor in actors:
+        actor.start()
+
+    try:
+        for update in range(num_updates):
+            # 채워진 슬롯을 꺼내 필요한 부분만 복사하고 곧바로 액터에게 돌려줌
+            slot = wait_for_slot(buffer, actors)
+            steps = int(buffer.steps[slot])
+            masks = buffer.masks[slot, :steps].copy()
+            states = torch.from_numpy(buffer.states[slot, :steps][masks])
+            actions = torch.from_numpy(buffer.actions[slot, :steps][masks])
+            behavior_log_probs = torch.from_numpy(buffer.behavior_log_probs[slot, :steps][masks])
+            rewards = buffer.rewards[slot, :steps].astype(np.float64)
+            total_lag += update - int(buffer.versions[slot])
+            buffer.free.put(slot)
+            total_steps += steps * envs_per_actor
+
+            # 에피소드별 총 보상 기록
+            for episode_reward in rewards.sum(axis=0).tolist():
+                rewards_history.append(episode_reward)
+                running_reward.append(episode_reward)
+
+            # 할인된 보상(returns) 계산과 정규화 (train_reinforce_batch와 동일)
+            returns = torch.as_tensor(discount_returns(rewards, gamma)[masks], dtype=torch.float32)
+            returns = (returns - returns.mean()) / (returns.std() + 1e-9)
+
+            # 잘린 중요도 비율로 보정한 정책 손실 (비율 자체는 상수로 취급)
+            log_probs = policy.log_prob(states, actions)
+            ratios = torch.exp(log_probs.detach() - behavior_log_probs).clamp(max=max_ratio)
+            policy_loss = -(ratios * log_probs * returns).sum() / envs_per_actor
+
+            # 네트워크 업데이트와 가중치 방송
+            optimizer.zero_grad()
+            policy_loss.backward()
+            optimizer.step()
+            num_completed += 1
+            if (update + 1) % broadcast_interval == 0:
+                weights.publish(policy, version=update + 1)
+
+            # 학습 진행상황 출력
+            if verbose and update % 10 == 0:
+                print(f'업데이트 {update}: 에피소드 {len(rewards_history)}, 평균 보상 = {np.mean(running_reward):.2f}')
+
+            # 목표 달성 체크 (최근 100 에피소드 평균 475점 이상)
+            if len(running_reward) == 100 and np.mean(running_reward) >= 475:
+                solved_time = time.perf_counter() - start
+                if verbose:
+                    print(f'환경 해결! {len(rewards_history)} 에피소드 ({solved_time:.1f}초) 후 평균 보상: {np.mean(running_reward):.2f}')
+                break
+    finally:
+        # 액터 종료 (남은 롤아웃을 마치고 빠져나오지 못하면 강제 종료)
+        stop_event.set()
+        for actor in actors:
+            actor.join(timeout=5)
+            if actor.is_alive():
+                actor.terminate()
+
+    elapsed = time.perf_counter() - start
+    stats = {
+        'total_steps': total_steps,
+        'seconds': elapsed,
+        'steps_per_sec': total_steps / elapsed,
+        'solved_time': solved_time,
+        'mean_lag': total_lag / num_completed if num_completed else 0.0,
+    }
+    return policy, rewards_history, stats
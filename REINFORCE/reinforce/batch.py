@@ -0,0 +1,119 @@
+import time
+from collections import deque
+import numpy as np
+import torch
+import torch.optim as optim
+from torch.distributions import Categorical
+try:
+    import gymnasium as gym
+except ImportError:  # gymnasium 없이 오프라인 실행: 로컬 NumPy CartPole 사용
+    gym = None
+from .networks import PolicyNetwork
+from .cartpole_env import BatchCartPoleEnv
+from .train import discount_returns
+
+def make_vector_env(num_envs, local=False):
+    """
+    CartPole-v1 벡터 환경 생성 (local=True이거나 gymnasium이 없으면 로컬 NumPy 배치 환경)
+    종료된 환경은 같은 스텝에서 자동 리셋 (종료 스텝의 보상과 다음 에피소드의 첫 상태를 함께 반환)
+    """
+    if local or gym is None:
+        return BatchCartPoleEnv(num_envs)
+    return gym.make_vec('CartPole-v1', num_envs=num_envs, vectorization_mode='sync',
+                        vector_kwargs={'autoreset_mode': gym.vector.AutoresetMode.SAME_STEP})
+
+def train_reinforce_batch(num_envs=16, num_updates=300, gamma=0.99, lr=0.01, seed=42, vec_env=None,
+                          hidden_dim=128, verbose=True):
+    """
+    N개의 CartPole 환경에서 에피소드를 하나씩 동시에 진행하고, N개 궤적 전체로 한 번 업데이트
+    스텝마다 N개 상태를 한 번의 순전파로 처리하며, 먼저 끝난 환경의 이후 스텝은 마스크로 제외
+    vec_env를 주면 그 벡터 환경(예: BatchCartPoleEnv)을 사용하고 num_envs는 무시
+    반환값: (정책, 에피소드 보상 기록, 통계: 환경 스텝 수, 시간, 초당 환경 스텝, 475 도달 시간)
+    """
+    if vec_env is None:
+        vec_env = make_vector_env(num_envs)
+    num_envs = vec_env.num_envs
+    input_dim = vec_env.single_observation_space.shape[0]
+    policy = PolicyNetwork(input_dim, vec_env.single_action_space.n, hidden_dim)
+    optimizer = optim.Adam(policy.parameters(), lr=lr)
+
+    # 결과 기록용
+    rewards_history = []
+    running_reward = deque(maxlen=100)
+    total_steps = 0
+    solved_time = None
+    start = time.perf_counter()
+
+    # 롤아웃 버퍼 미리 할당 (스텝 x 환경)
+    max_steps = vec_env.spec.max_episode_steps
+    states_buffer = torch.zeros((max_steps, num_envs, input_dim))
+    actions_buffer = torch.zeros((max_steps, num_envs), dtype=torch.long)
+    rewards_buffer = np.zeros((max_steps, num_envs))
+    masks_buffer = np.zeros((max_steps, num_envs), dtype=bool)
+
+    for update in range(num_updates):
+        # 모든 환경에서 새로운 에피소드 시작
+        states, _ = vec_env.reset(seed=seed if update == 0 else None)
+        active = np.ones(num_envs, dtype=bool)
+        steps = 0
+
+        # 모든 환경의 에피소드가 끝날 때까지 실행 (그래디언트 그래프 없이 상태와 행동만 기록)
+        with torch.no_grad():
+            while active.any():
+                # N개 상태에 대해 한 번의 순전파로 행동 선택
+                states_buffer[steps] = torch.as_tensor(states, dtype=torch.float32)
+                actions = Categorical(policy(states_buffer[steps])).sample()
+
+                states, reward, terminated, truncated, _ = vec_env.step(actions.numpy())
+
+                # 경험 저장 (이미 끝난 환경의 스텝은 마스크로 제외)
+                actions_buffer[steps] = actions
+                rewards_buffer[steps] = reward * active
+                masks_buffer[steps] = active
+                active &= ~(terminated | truncated)
+                steps += 1
+                total_steps += num_envs
+
+        rewards = rewards_buffer[:steps]
+        masks = torch.as_tensor(masks_buffer[:steps])
+
+        # 에피소드별 총 보상 기록
+        for episode_reward in rewards.sum(axis=0).tolist():
+            rewards_history.append(episode_reward)
+            running_reward.append(episode_reward)
+
+        # 할인된 보상(returns) 계산 (환경별로 뒤에서부터, 끝난 뒤의 보상은 0)
+        returns = torch.as_tensor(discount_returns(rewards, gamma), dtype=torch.float32)[masks]
+
+        # 배치 전체 유효 스텝 기준으로 리턴 정규화
+        returns = (returns - returns.mean()) / (returns.std() + 1e-9)
+
+        # 정책 손실: 유효 스텝의 로그 확률을 한 번의 순전파로 다시 계산, 에피소드당 평균
+        log_probs = policy.log_prob(states_buffer[:steps][masks], actions_buffer[:steps][masks])
+        policy_loss = -(log_probs * returns).sum() / num_envs
+
+        # 네트워크 업데이트
+        optimizer.zero_grad()
+        policy_loss.backward()
+        optimizer.step()
+
+        # 학습 진행상황 출력
+        if verbose and update % 10 == 0:
+            print(f'업데이트 {update}: 에피소드 {len(rewards_history)}, 평균 보상 = {np.mean(running_reward):.2f}')
+
+        # 목표 달성 체크 (최근 100 에피소드 평균 475점 이상)
+        if len(running_reward) == 100 and np.mean(running_reward) >= 475:
+            solved_time = time.perf_counter() - start
+            if verbose:
+                print(f'환경 해결! {len(rewards_history)} 에피소드 ({solved_time:.1f}초) 후 평균 보상: {np.mean(running_reward):.2f}')
+            break
+
+    elapsed = time.perf_counter() - start
+    vec_env.close()
+    stats = {
+        'total_steps': total_steps,
+        'seconds': elapsed,
+        'steps_per_sec': total_steps / elapsed,
+        'solved_time': solved_time,
+    }
+    return policy, rewards_history, stats
@@ -0,0 +1,202 @@
+import math
+from types import SimpleNamespace
+import numpy as np
+
+# CartPole-v1 물리 상수 (gymnasium CartPoleEnv와 동일)
+GRAVITY = 9.8
+MASS_CART = 1.0
+MASS_POLE = 0.1
+TOTAL_MASS = MASS_POLE + MASS_CART
+LENGTH = 0.5  # 막대 길이의 절반
+POLEMASS_LENGTH = MASS_POLE * LENGTH
+FORCE_MAG = 10.0
+TAU = 0.02  # 스텝 간격 (초)
+
+# 종료 조건과 에피소드 최대 길이
+THETA_THRESHOLD = 12 * 2 * math.pi / 360
+X_THRESHOLD = 2.4
+MAX_EPISODE_STEPS = 500
+
+class Box:
+    """연속 관측 공간 (gymnasium.spaces.Box의 shape/sample만 흉내)"""
+    def __init__(self, low, high, seed=None):
+        self.low = np.asarray(low, dtype=np.float32)
+        self.high = np.asarray(high, dtype=np.float32)
+        self.shape = self.low.shape
+        self.rng = np.random.default_rng(seed)
+
+    def sample(self):
+        # 유한 구간은 균등, 무한 구간은 표준 정규 분포에서 샘플링
+        bounded = np.isfinite(self.low) & np.isfinite(self.high)
+        uniform = self.rng.uniform(np.where(bounded, self.low, 0.0), np.where(bounded, self.high, 1.0))
+        return np.where(bounded, uniform, self.rng.normal(size=self.shape)).astype(np.float32)
+
+class Discrete:
+    """이산 행동 공간 (gymnasium.spaces.Discrete의 n/sample만 흉내)"""
+    def __init__(self, n, seed=None):
+        self.n = n
+        self.rng = np.random.default_rng(seed)
+
+    def sample(self):
+        return int(self.rng.integers(self.n))
+
+class BatchCartPoleEnv:
+    """
+    N개의 CartPole-v1 상태를 (N, 4) 배열 하나로 두고 오일러 적분으로 한꺼번에 진행하는 NumPy 환경
+    reset/step은 gymnasium 벡터 환경과 같은 5-튜플 배열을 반환하며,
+    종료(막대 각도/카트 위치 초과) 또는 500 스텝 도달(truncated)한 환경은 같은 스텝에서 자동 리셋된다.
+    (gymnasium AutoresetMode.SAME_STEP과 같이 종료 스텝의 보상과 다음 에피소드의 첫 관측을 반환)
+    """
+    def __init__(self, num_envs, seed=None, max_episode_steps=MAX_EPISODE_STEPS):
+        self.num_envs = num_envs
+        self.spec = SimpleNamespace(id='CartPole-v1', max_episode_steps=max_episode_steps)
+        high = np.array([X_THRESHOLD * 2, np.inf, THETA_THRESHOLD * 2, np.inf], dtype=np.float32)
+        self.single_observation_space = Box(-high, high, seed=seed)
+        self.single_action_space = Discrete(2, seed=seed)
+        self.rng = np.random.default_rng(seed)
+        self.state = np.zeros((num_envs, 4))
+        self.elapsed_steps = np.zeros(num_envs, dtype=np.int64)
+
+    def reset(self, seed=None, options=None):
+        if seed is not None:
+            self.rng = np.random.default_rng(seed)
+        self.state = self.rng.uniform(-0.05, 0.05, size=(self.num_envs, 4))
+        self.elapsed_steps[:] = 0
+        return self.state.astype(np.float32), {}
+
+    def step(self, actions):
+        x, x_dot, theta, theta_dot = self.state.T
+        force = np.where(np.asarray(actions) == 1, FORCE_MAG, -FORCE_MAG)
+        costheta = np.cos(theta)
+        sintheta = np.sin(theta)
+
+        temp = (force + POLEMASS_LENGTH * theta_dot ** 2 * sintheta) / TOTAL_MASS
+        thetaacc = (GRAVITY * sintheta - costheta * temp) / (
+            LENGTH * (4.0 / 3.0 - MASS_POLE * costheta ** 2 / TOTAL_MASS))
+        xacc = temp - POLEMASS_LENGTH * thetaacc * costheta / TOTAL_MASS
+
+        # 오일러 적분
+        self.state = np.stack([
+            x + TAU * x_dot,
+            x_dot + TAU * xacc,
+            theta + TAU * theta_dot,
+            theta_dot + TAU * thetaacc,
+        ], axis=1)
+        self.elapsed_steps += 1
+
+        terminated = ((np.abs(self.state[:, 0]) > X_THRESHOLD)
+                      | (np.abs(self.state[:, 2]) > THETA_THRESHOLD))
+        # gymnasium TimeLimit과 같이 종료와 시간 제한이 같은 스텝에 겹치면 둘 다 True
+        truncated = self.elapsed_steps >= self.spec.max_episode_steps
+        rewards = np.ones(self.num_envs)
+
+        # 끝난 환경은 같은 스텝에서 자동 리셋
+        done = terminated | truncated
+        info = {}
+        if done.any():
+            info['final_obs'] = self.state.astype(np.float32)
+            self.state[done] = self.rng.uniform(-0.05, 0.05, size=(int(done.sum()), 4))
+            self.elapsed_steps[done] = 0
+
+        return self.state.astype(np.float32), rewards, terminated, truncated, info
+
+    def close(self):
+        pass
+
+class CartPoleEnv:
+    """
+    BatchCartPoleEnv 한 개짜리를 gym.make('CartPole-v1')처럼 쓰는 단일 환경
+    (관측은 (4,) 배열, 보상/종료 여부는 파이썬 스칼라, 자동 리셋 없음)
+    """
+    def __init__(self, seed=None, max_episode_steps=MAX_EPISODE_STEPS):
+        self.batch_env = BatchCartPoleEnv(1, seed=seed, max_episode_steps=max_episode_steps)
+        self.spec = self.batch_env.spec
+        self.observation_space = self.batch_env.single_observation_space
+        self.action_space = self.batch_env.single_action_space
+
+    @property
+    def state(self):
+        return self.batch_env.state[0]
+
+    @property
+    def unwrapped(self):
+        return self
+
+    @property
+    def np_random(self):
+        # gymnasium 환경의 env.unwrapped.np_random과 같은 자리 (체크포인트에 난수 상태 저장용)
+        return self.batch_env.rng
+
+    def reset(self, seed=None, options=None):
+        observations, info = self.batch_env.reset(seed=seed)
+        return observations[0], info
+
+    def step(self, action):
+        observations, rewards, terminated, truncated, info = self.batch_env.step(np.array([action]))
+        if 'final_obs' in info:
+            # 자동 리셋 전의 마지막 관측 반환
+            observations = info['final_obs']
+        return observations[0], float(rewards[0]), bool(terminated[0]), bool(truncated[0]), {}
+
+    def render(self):
+        x, _, theta, _ = self.state
+        print(f"카트 위치: {x:+.3f}, 막대 각도: {math.degrees(theta):+.2f}도")
+
+    def close(self):
+        pass
+
+def check_gymnasium_parity(num_episodes=20, seed=0, atol=1e-5):
+    """
+    gymnasium CartPole-v1과 같은 초기 상태, 같은 행동열로 진행해 관측과 종료/시간 제한 신호를 비교
+    gymnasium이 없으면 None, 있으면 관측의 최대 절대 오차를 반환 (불일치 시 AssertionError)
+    """
+    try:
+        import gymnasium as gym
+    except ImportError:
+        print("gymnasium이 설치되어 있지 않아 비교를 건너뜁니다.")
+        return None
+
+    gym_env = gym.make('CartPole-v1')
+    env = CartPoleEnv()
+    rng = np.random.default_rng(seed)
+    max_error = 0.0
+
+    def compare_step(action, label):
+        gym_obs, gym_reward, gym_terminated, gym_truncated, _ = gym_env.step(action)
+        obs, reward, terminated, truncated, _ = env.step(action)
+        assert np.allclose(obs, gym_obs, atol=atol), f"{label}: 관측 불일치 {obs} != {gym_obs}"
+        assert (reward, terminated, truncated) == (gym_reward, gym_terminated, gym_truncated), \
+            f"{label}: 보상/종료 신호 불일치 {(reward, terminated, truncated)} != " \
+            f"{(gym_reward, gym_terminated, gym_truncated)}"
+        return float(np.max(np.abs(obs - gym_obs))), terminated, truncated
+
+    for episode in range(num_episodes):
+        gym_env.reset(seed=seed + episode)
+        env.reset()
+        # gymnasium 내부 상태(float64)를 그대로 복사해 같은 초기 상태에서 시작
+        env.batch_env.state[0] = gym_env.unwrapped.state
+        done = False
+        while not done:
+            # 절반은 무작위, 절반은 막대가 기운 쪽으로 밀어 긴 에피소드도 포함
+            action = int(rng.integers(2)) if episode % 2 == 0 else int(env.state[2] + 0.5 * env.state[3] > 0)
+            error, terminated, truncated = compare_step(action, f"에피소드 {episode}")
+            max_error = max(max_error, error)
+            done = terminated or truncated
+
+    # 마지막(500번째) 스텝에서 막대가 넘어지는 경우: terminated와 truncated가 모두 True여야 함
+    gym_env.reset(seed=seed)
+    env.reset()
+    edge_state = np.array([0.0, 0.0, THETA_THRESHOLD - 1e-3, 1.0])
+    gym_env.unwrapped.state = edge_state.copy()
+    env.batch_env.state[0] = edge_state
+    gym_env._elapsed_steps = env.spec.max_episode_steps - 1  # gym.make가 씌운 TimeLimit의 스텝 수
+    env.batch_env.elapsed_steps[0] = env.spec.max_episode_steps - 1
+    error, terminated, truncated = compare_step(1, "500번째 스텝 종료")
+    assert terminated and truncated, "500번째 스텝 종료 경우가 만들어지지 않았습니다."
+    max_error = max(max_error, error)
+    gym_env.close()
+    print(f"gymnasium CartPole-v1과 일치: 에피소드 {num_episodes}개와 500번째 스텝 종료, 관측 최대 오차 {max_error:.2e}")
+    return max_error
+
+if __name__ == "__main__":
+    check_gymnasium_parity()
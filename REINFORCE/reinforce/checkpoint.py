@@ -0,0 +1,31 @@
+import os
+import torch
+from .networks import PolicyNetwork
+
+# 체크포인트 디렉터리 안의 파일 이름
+CHECKPOINT_FILE = 'checkpoint.pt'
+
+def save_checkpoint(checkpoint_dir, state):
+    """
+    학습 상태 딕셔너리(모델/옵티마이저 state_dict, 난수 상태, 에피소드 수, 보상 기록, 설정)를 저장
+    임시 파일에 쓴 뒤 교체하므로 저장 중에 중단되어도 이전 체크포인트가 깨지지 않는다.
+    """
+    os.makedirs(checkpoint_dir, exist_ok=True)
+    path = os.path.join(checkpoint_dir, CHECKPOINT_FILE)
+    torch.save(state, path + '.tmp')
+    os.replace(path + '.tmp', path)
+
+def load_checkpoint(checkpoint_dir):
+    """체크포인트 읽기 (직접 저장한 파일이므로 NumPy 난수 상태 등 텐서가 아닌 객체도 함께 복원)"""
+    return torch.load(os.path.join(checkpoint_dir, CHECKPOINT_FILE), weights_only=False)
+
+def has_checkpoint(checkpoint_dir):
+    """체크포인트 디렉터리에 재개 가능한 체크포인트가 있는지 확인"""
+    return checkpoint_dir is not None and os.path.exists(os.path.join(checkpoint_dir, CHECKPOINT_FILE))
+
+def load_policy(checkpoint_dir, env):
+    """재학습 없이 테스트/서빙하기 위해 체크포인트의 정책 네트워크를 평가 모드로 생성"""
+    state = load_checkpoint(checkpoint_dir)
+    policy = PolicyNetwork(env.observation_space.shape[0], env.action_space.n, state['config']['hidden_dim'])
+    policy.load_state_dict(state['policy'])
+    return policy.eval()
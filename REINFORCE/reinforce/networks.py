@@ -0,0 +1,73 @@
+import numpy as np
+import torch
+import torch.nn as nn
+import torch.nn.functional as F
+from torch.distributions import Categorical
+
+# 정책 네트워크 정의
+class PolicyNetwork(nn.Module):
+    def __init__(self, input_dim, output_dim, hidden_dim=128):
+        super(PolicyNetwork, self).__init__()
+        self.fc1 = nn.Linear(input_dim, hidden_dim)
+        self.fc2 = nn.Linear(hidden_dim, output_dim)
+        # 롤아웃용 입력 버퍼 (스텝마다 새 텐서를 만들지 않고 재사용)
+        self._input_buffer = torch.zeros(1, input_dim)
+
+    def logits(self, x):
+        x = F.relu(self.fc1(x))
+        return self.fc2(x)
+
+    def forward(self, x):
+        return F.softmax(self.logits(x), dim=1)
+
+    def log_prob(self, states, actions): # 상태 배치와 행동 배치의 로그 확률을 한 번의 순전파로 계산
+        log_probs = F.log_softmax(self.logits(states), dim=-1)
+        return log_probs.gather(-1, actions.unsqueeze(-1)).squeeze(-1)
+
+    def select_action(self, state): # 현재 상태를 받아 어떤 행동을 선택할지 확률적으로 결정
+        state = torch.FloatTensor(state).unsqueeze(0)
+        probs = self.forward(state)
+        m = Categorical(probs)
+        action = m.sample()
+        log_prob = m.log_prob(action)
+        return action.item(), log_prob
+
+    @torch.inference_mode()
+    def act(self, state): # 롤아웃/테스트용 행동 선택 (그래디언트 추적 없음, 입력 버퍼 재사용)
+        self._input_buffer.numpy()[0] = state
+        probs = F.softmax(self.logits(self._input_buffer)[0], dim=0)
+        return torch.multinomial(probs, 1).item()
+
+# 정책 네트워크 순전파와 샘플링의 순수 NumPy 버전 (업데이트 후 sync로 가중치 동기화)
+class NumpyPolicy:
+    def __init__(self, policy, seed=None):
+        self.rng = np.random.default_rng(seed)
+        self.sync(policy)
+
+    def sync(self, policy): # torch 정책 네트워크의 가중치 복사
+        self.w1 = policy.fc1.weight.detach().numpy().T.copy()
+        self.b1 = policy.fc1.bias.detach().numpy().copy()
+        self.w2 = policy.fc2.weight.detach().numpy().T.copy()
+        self.b2 = policy.fc2.bias.detach().numpy().copy()
+
+    def probs(self, states): # 상태(배치)의 행동 확률
+        hidden = np.maximum(states @ self.w1 + self.b1, 0.0)
+        logits = hidden @ self.w2 + self.b2
+        exp = np.exp(logits - logits.max(axis=-1, keepdims=True))
+        return exp / exp.sum(axis=-1, keepdims=True)
+
+    def act(self, state): # 누적 확률과 균등 난수 하나로 행동 샘플링
+        cumulative = np.cumsum(self.probs(np.asarray(state, dtype=np.float32)))
+        return min(int(np.searchsorted(cumulative, self.rng.random() * cumulative[-1], side='right')),
+                   len(cumulative) - 1)
+
+# 가치 네트워크 (critic): 상태 가치 V(s) 추정, 기준선/GAE 어드밴티지 계산에 사용
+class ValueNetwork(nn.Module):
+    def __init__(self, input_dim, hidden_dim=128):
+        super(ValueNetwork, self).__init__()
+        self.fc1 = nn.Linear(input_dim, hidden_dim)
+        self.fc2 = nn.Linear(hidden_dim, 1)
+
+    def forward(self, x): # 상태 배치 -> 가치 배치 (마지막 축 제거)
+        x = F.relu(self.fc1(x))
+        return self.fc2(x).squeeze(-1)
@@ -0,0 +1,292 @@
+import warnings
+from collections import deque
+import numpy as np
+import torch
+import torch.optim as optim
+import torch.nn.functional as F
+from torch.distributions import Categorical
+try:
+    import gymnasium as gym
+except ImportError:  # gymnasium 없이 오프라인 실행: 로컬 NumPy CartPole 사용
+    gym = None
+from .networks import PolicyNetwork, NumpyPolicy, ValueNetwork
+from .cartpole_env import CartPoleEnv
+from .checkpoint import save_checkpoint, load_checkpoint, has_checkpoint
+
+# 체크포인트에 함께 저장하고 재개 시 일치를 확인하는 학습 설정 (train_reinforce 인자 이름)
+CONFIG_KEYS = ['gamma', 'lr', 'hidden_dim', 'numpy_rollout', 'advantage', 'gae_lambda',
+               'entropy_coef', 'value_lr', 'value_steps', 'seed']
+
+def configure_threads(num_threads=None, num_interop_threads=None):
+    """
+    torch 연산(intra-op)/인터옵 스레드 수 설정 (None이면 그대로)
+    한 머신에 학습을 여러 개 띄울 때 프로세스마다 1로 두면 코어를 서로 빼앗지 않는다.
+    인터옵 스레드 수는 병렬 작업이 시작되기 전에 한 번만 바꿀 수 있어, 이미 시작됐으면 경고만 한다.
+    """
+    if num_threads is not None:
+        torch.set_num_threads(num_threads)
+    if num_interop_threads is not None and torch.get_num_interop_threads() != num_interop_threads:
+        try:
+            torch.set_num_interop_threads(num_interop_threads)
+        except RuntimeError as e:
+            warnings.warn(f"인터옵 스레드 수를 바꿀 수 없습니다: {e}")
+
+def make_env(local=False):
+    """CartPole-v1 환경 생성 (local=True이거나 gymnasium이 없으면 같은 동역학의 로컬 NumPy 환경)"""
+    if local or gym is None:
+        return CartPoleEnv()
+    return gym.make('CartPole-v1')
+
+def discount_returns(rewards, gamma):
+    """
+    할인된 보상 G_t = r_t + γ G_(t+1)을 뒤에서부터 계산 (첫 축이 시간)
+    γ^k가 1e-100 아래로 내려가지 않는 길이의 구간마다 뒤집은 누적합을 γ^k로 나눠 한 번에 계산하고,
+    구간 사이는 뒤 구간 첫 스텝의 리턴을 할인해 이어 붙인다 (γ가 작아도 0/0 없음, γ=0이면 스텝마다 한 구간).
+    """
+    rewards = np.asarray(rewards, dtype=np.float64)
+    block = len(rewards) if gamma >= 1 else int(np.log(1e-100) / np.log(gamma)) + 1 if gamma > 0 else 1
+    shape = (-1,) + (1,) * (rewards.ndim - 1)
+    returns = np.empty_like(rewards)
+    following = np.zeros(rewards.shape[1:])  # 뒤 구간 첫 스텝의 리턴
+    for end in range(len(rewards), 0, -max(block, 1)):
+        start = max(end - block, 0)
+        discounts = gamma ** np.arange(end - start, dtype=np.float64).reshape(shape)
+        segment = np.cumsum((rewards[start:end] * discounts)[::-1], axis=0)[::-1] / discounts
+        returns[start:end] = segment + gamma * discounts[::-1] * following
+        following = returns[start]
+    return returns
+
+def gae_advantages(deltas, gamma, gae_lambda):
+    """
+    GAE(λ) 어드밴티지 A_t = Σ (γλ)^(k-t) δ_k를 뒤에서부터 누적 (첫 축이 시간)
+    할인율 γλ의 discount_returns와 같은 계산 (γλ가 작거나 0이어도 안정적)
+    """
+    return discount_returns(deltas, gamma * gae_lambda)
+
+def reinforce_update(policy, optimizer, states, actions, rewards, gamma, critic=None, critic_optimizer=None,
+                     advantage='returns', gae_lambda=0.95, value_steps=10, entropy_coef=0.0, bootstrap_state=None):
+    """
+    에피소드 하나(상태, 행동 텐서와 보상 배열)로 정책을 한 번 업데이트 (train_reinforce의 에피소드 종료 후 단계)
+    critic이 있으면 advantage('baseline'/'gae')에 따라 어드밴티지를 계산하고 가치 네트워크를 value_steps번 학습
+    bootstrap_state: 시간 제한으로 잘린 에피소드의 마지막 다음 상태 (GAE 부트스트랩용, 종료된 에피소드는 None)
+    """
+    # 할인된 보상(returns) 계산
+    returns = discount_returns(rewards, gamma)
+
+    # 어드밴티지 계산 (기존 방식은 리턴 자체, 기준선/GAE는 가치 네트워크의 추정값 사용)
+    if critic is None:
+        advantages = returns
+    else:
+        with torch.no_grad():
+            values = critic(states).double().numpy()
+        if advantage == 'baseline':
+            advantages = returns - values
+            value_targets = returns
+        else:
+            with torch.no_grad():
+                bootstrap = 0.0 if bootstrap_state is None else critic(torch.as_tensor(bootstrap_state)).item()
+            deltas = rewards + gamma * np.append(values[1:], bootstrap) - values
+            advantages = gae_advantages(deltas, gamma, gae_lambda)
+            value_targets = advantages + values
+
+        # 가치 네트워크 업데이트 (목표값 회귀, 에피소드마다 value_steps번)
+        value_targets = torch.as_tensor(value_targets, dtype=torch.float32)
+        for _ in range(value_steps):
+            value_loss = F.mse_loss(critic(states), value_targets)
+            critic_optimizer.zero_grad()
+            value_loss.backward()
+            critic_optimizer.step()
+
+    # 어드밴티지 정규화
+    advantages = torch.as_tensor(advantages, dtype=torch.float32)
+    advantages = (advantages - advantages.mean()) / (advantages.std() + 1e-9)
+
+    # 정책 손실 계산 (에피소드 전체 로그 확률을 한 번의 순전파로 다시 계산)
+    dist = Categorical(logits=policy.logits(states))
+    log_probs = dist.log_prob(actions)
+    policy_loss = -(log_probs * advantages).sum()  # 정책 그래디언트 공식
+    if entropy_coef > 0:
+        policy_loss = policy_loss - entropy_coef * dist.entropy().sum()
+
+    # 네트워크 업데이트
+    optimizer.zero_grad()
+    policy_loss.backward()
+    optimizer.step()
+
+def train_reinforce(env=None, num_episodes=1000, gamma=0.99, lr=0.01, hidden_dim=128, numpy_rollout=False,
+                    advantage='returns', gae_lambda=0.95, entropy_coef=0.0, value_lr=0.01, value_steps=10,
+                    seed=None, verbose=True, checkpoint_dir=None, checkpoint_interval=100, resume=False):
+    """
+    REINFORCE 학습 루프 (env가 없으면 make_env()로 생성)
+    advantage: 정책 그래디언트에 곱할 값
+      'returns'  - 에피소드별로 정규화한 몬테카를로 리턴 (기존 방식)
+      'baseline' - G_t - V(s_t) (REINFORCE with baseline, 가치 네트워크가 G_t를 회귀)
+      'gae'      - GAE(λ) 어드밴티지 (gae_lambda=0이면 1-step TD, 1이면 'baseline'과 같은 몬테카를로)
+    'baseline'/'gae'는 별도의 가치 네트워크(critic)를 에피소드마다 value_steps번, value_lr로 함께 학습하며
+    어드밴티지는 정규화해서 사용 (한 번만 학습하면 가치 추정이 리턴의 크기를 따라가지 못해 오히려 느려짐)
+    entropy_coef > 0이면 정책 엔트로피 보너스를 더해 너무 이른 결정적 정책을 막음
+    checkpoint_dir를 주면 checkpoint_interval 에피소드마다(그리고 Ctrl-C로 중단될 때) 모델, 옵티마이저,
+    난수 상태를 저장하고, resume=True면 최신 체크포인트부터 이어서 학습한다 (설정이 다르면 ValueError).
+    반환값: (정책 네트워크, 에피소드 보상 기록)
+    """
+    if advantage not in ('returns', 'baseline', 'gae'):
+        raise ValueError(f"알 수 없는 advantage: {advantage}")
+    config = {'gamma': gamma, 'lr': lr, 'hidden_dim': hidden_dim, 'numpy_rollout': numpy_rollout,
+              'advantage': advantage, 'gae_lambda': gae_lambda, 'entropy_coef': entropy_coef,
+              'value_lr': value_lr, 'value_steps': value_steps, 'seed': seed}
+    if env is None:
+        env = make_env()
+    input_dim = env.observation_space.shape[0]
+    output_dim = env.action_space.n
+    if seed is not None:
+        torch.manual_seed(seed)
+
+    # 정책 네트워크와 옵티마이저 초기화
+    policy = PolicyNetwork(input_dim, output_dim, hidden_dim)
+    optimizer = optim.Adam(policy.parameters(), lr=lr)
+
+    # 가치 네트워크 (기준선/GAE를 쓸 때만)
+    critic = ValueNetwork(input_dim, hidden_dim) if advantage != 'returns' else None
+    critic_optimizer = optim.Adam(critic.parameters(), lr=value_lr) if critic is not None else None
+
+    # 롤아웃 행동 선택: 기본은 inference_mode 경로, numpy_rollout=True면 NumPy 순전파 (업데이트마다 동기화)
+    rollout_policy = NumpyPolicy(policy, seed=seed) if numpy_rollout else policy
+
+    # 결과 기록용 (체크포인트에서 재개하면 이어서 기록)
+    rewards_history = []
+    start_episode = 0
+    reset_seed = seed
+    if resume and has_checkpoint(checkpoint_dir):
+        checkpoint = load_checkpoint(checkpoint_dir)
+        if checkpoint['config'] != config:
+            raise ValueError(f"체크포인트 설정 {checkpoint['config']}이 학습 설정 {config}와 다릅니다.")
+        policy.load_state_dict(checkpoint['policy'])
+        optimizer.load_state_dict(checkpoint['optimizer'])
+        if critic is not None:
+            critic.load_state_dict(checkpoint['critic'])
+            critic_optimizer.load_state_dict(checkpoint['critic_optimizer'])
+        if numpy_rollout:
+            rollout_policy.sync(policy)
+            rollout_policy.rng.bit_generator.state = checkpoint['numpy_policy_rng']
+        torch.set_rng_state(checkpoint['torch_rng'])
+        env.unwrapped.np_random.bit_generator.state = checkpoint['env_rng']
+        rewards_history = checkpoint['rewards_history']
+        start_episode = len(rewards_history)
+        reset_seed = None
+        if verbose:
+            print(f"체크포인트에서 재개: 에피소드 {start_episode}부터")
+        if checkpoint['solved']:
+            return policy, rewards_history
+    running_reward = deque(rewards_history[-100:], maxlen=100)
+
+    def save(solved=False):
+        save_checkpoint(checkpoint_dir, {
+            'config': config,
+            'policy': policy.state_dict(),
+            'optimizer': optimizer.state_dict(),
+            'critic': critic.state_dict() if critic is not None else None,
+            'critic_optimizer': critic_optimizer.state_dict() if critic is not None else None,
+            'numpy_policy_rng': rollout_policy.rng.bit_generator.state if numpy_rollout else None,
+            'torch_rng': torch.get_rng_state(),
+            'env_rng': env.unwrapped.np_random.bit_generator.state,
+            'rewards_history': rewards_history,
+            'solved': solved,
+        })
+
+    # 롤아웃 버퍼 미리 할당 (상태와 행동만 저장, 로그 확률은 업데이트 때 다시 계산)
+    max_steps = env.spec.max_episode_steps
+    states_buffer = torch.zeros((max_steps, input_dim))
+    actions_buffer = torch.zeros(max_steps, dtype=torch.long)
+    rewards_buffer = np.zeros(max_steps)
+
+    solved = False
+    try:
+        for episode in range(start_episode, num_episodes):
+            # 새로운 에피소드 시작 (처음 한 번만 시드 지정, 이후와 재개 시에는 환경의 난수 상태를 이어서 사용)
+            state, _ = env.reset(seed=reset_seed)
+            reset_seed = None
+            steps = 0
+            done = False
+
+            # 에피소드 실행 (그래디언트 그래프 없이 상태와 행동만 기록)
+            with torch.no_grad():
+                while not done:
+                    # 행동 선택
+                    states_buffer[steps] = torch.as_tensor(state)
+                    action = rollout_policy.act(state)
+
+                    # 환경에서 한 스텝 진행
+                    next_state, reward, terminated, truncated, _ = env.step(action)
+                    done = terminated or truncated
+
+                    # 경험 저장
+                    actions_buffer[steps] = action
+                    rewards_buffer[steps] = reward
+                    steps += 1
+
+                    state = next_state
+
+            # 에피소드 종료 후 총 보상 계산
+            episode_reward = float(rewards_buffer[:steps].sum())
+            rewards_history.append(episode_reward)
+            running_reward.append(episode_reward)
+
+            # 정책(과 가치 네트워크) 업데이트 (GAE는 시간 제한으로 잘린 경우 마지막 다음 상태로 부트스트랩)
+            reinforce_update(policy, optimizer, states_buffer[:steps], actions_buffer[:steps], rewards_buffer[:steps],
+                             gamma, critic=critic, critic_optimizer=critic_optimizer, advantage=advantage,
+                             gae_lambda=gae_lambda, value_steps=value_steps, entropy_coef=entropy_coef,
+                             bootstrap_state=None if terminated else state)
+            if numpy_rollout:
+                rollout_policy.sync(policy)
+
+            # 학습 진행상황 출력
+            if verbose and episode % 20 == 0:
+                avg_reward = np.mean(running_reward) if running_reward else 0
+                print(f'에피소드 {episode}: 보상 = {episode_reward}, 평균 보상 = {avg_reward:.2f}')
+
+            # 목표 달성 체크 (CartPole-v1은 475점 이상이면 해결로 간주)
+            if len(running_reward) == 100 and np.mean(running_reward) >= 475:
+                solved = True
+                if verbose:
+                    print(f'환경 해결! {episode} 에피소드 후 평균 보상: {np.mean(running_reward):.2f}')
+                break
+
+            # 주기적 체크포인트 저장
+            if checkpoint_dir is not None and (episode + 1) % checkpoint_interval == 0:
+                save()
+    except KeyboardInterrupt:
+        # 중단 시점의 상태로 체크포인트 저장 (주기적 저장과 달리 재개 결과가 끊김 없이 학습한 것과 같지는 않음)
+        if checkpoint_dir is not None:
+            save()
+            print(f"중단됨: 에피소드 {len(rewards_history)}까지 체크포인트 저장")
+        raise
+
+    if checkpoint_dir is not None:
+        save(solved)
+
+    return policy, rewards_history
+
+def test_agent(policy, env, num_episodes=3, render=False):
+    for episode in range(num_episodes):
+        state, _ = env.reset()
+        episode_reward = 0
+        done = False
+        step = 0
+
+        while not done:
+            if render:
+                env.render()
+
+            # 행동 선택 (학습된 정책 사용, 추론 경로)
+            action = policy.act(state)
+
+            # 환경에서 한 스텝 진행
+            state, reward, terminated, truncated, _ = env.step(action)
+            done = terminated or truncated
+
+            episode_reward += reward
+            step += 1
+
+        print(f'테스트 에피소드 {episode+1}: 보상 = {episode_reward}, 스텝 = {step}')
+
+    env.close()
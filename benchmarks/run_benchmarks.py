@@ -0,0 +1,307 @@
+"""
+세 하위 프로젝트(MDP, MC, REINFORCE)의 핫 패스 처리량 벤치마크
+
+사용 예 (저장소 루트에서):
+    python benchmarks/run_benchmarks.py --size small --output baseline_small.json   # 기준 결과 저장
+    python benchmarks/run_benchmarks.py --size small --baseline baseline_small.json --tolerance 0.2
+
+각 벤치마크는 한 번 예열하면서 측정 한 번이 min_time초(기본 0.2초) 이상이 되도록 묶어 실행할 횟수를 정하고,
+모든 벤치마크를 번갈아 가며 repeats바퀴 측정해 가장 빠른 시간으로 처리량(단위/초)을 계산한다.
+--baseline을 주면 같은 크기의 기준 결과와 비교해, 처리량이 기준의 (1 - tolerance)배 아래로 떨어진
+벤치마크가 하나라도 있으면 종료 코드 1로 끝난다. 허용 비율은 두 결과의 반복 측정 잡음만큼 넓혀서 적용한다.
+"""
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import importlib
+import subprocess
+from datetime import datetime, timezone
+import numpy as np
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 문제 크기 설정
+SIZES = {
+    'small': {
+        'grid_size': 5, 'grid_steps': 20000, 'learn_steps': 20000, 'train_episodes': 200,
+        'board_size': 10, 'jump_steps': 20000, 'mc_episodes': 500,
+        'policy_actions': 2000, 'update_episodes': 50, 'episode_length': 200,
+    },
+    'medium': {
+        'grid_size': 10, 'grid_steps': 100000, 'learn_steps': 100000, 'train_episodes': 1000,
+        'board_size': 20, 'jump_steps': 100000, 'mc_episodes': 2000,
+        'policy_actions': 10000, 'update_episodes': 200, 'episode_length': 500,
+    },
+    'large': {
+        'grid_size': 20, 'grid_steps': 500000, 'learn_steps': 500000, 'train_episodes': 3000,
+        'board_size': 40, 'jump_steps': 500000, 'mc_episodes': 10000,
+        'policy_actions': 50000, 'update_episodes': 500, 'episode_length': 500,
+    },
+}
+
+def load_modules(subdir, *names):
+    """
+    하위 프로젝트 디렉터리의 모듈을 다른 프로젝트와 섞이지 않게 임포트
+    MDP와 MC는 visualization처럼 같은 이름의 형제 모듈을 이름만으로 임포트하므로,
+    디렉터리를 sys.path 맨 앞에 잠시 넣어 임포트한 뒤 그 디렉터리에서 온 모듈을 sys.modules에서 지운다.
+    (반환한 모듈 객체는 그대로 쓸 수 있지만, 모듈 이름으로 피클링하는 멀티프로세싱 경로는 쓸 수 없음)
+    """
+    directory = os.path.join(REPO_ROOT, subdir)
+    sys.path.insert(0, directory)
+    try:
+        return [importlib.import_module(name) for name in names]
+    finally:
+        sys.path.remove(directory)
+        for name, module in list(sys.modules.items()):
+            path = getattr(module, '__file__', None)
+            if path and os.path.abspath(path).startswith(directory + os.sep):
+                del sys.modules[name]
+
+# 벤치마크: 크기 설정을 받아 (반복 실행할 함수, 한 번 실행의 작업량, 단위) 반환
+
+def bench_gridworld_step(params):
+    environment, = load_modules('MDP', 'environment')
+    env = environment.GridWorld(size=params['grid_size'])
+    actions = np.random.default_rng(0).integers(4, size=params['grid_steps']).tolist()
+
+    def run():
+        env.reset()
+        for action in actions:
+            if env.step(action)[2]:
+                env.reset()
+    return run, len(actions), 'steps'
+
+def bench_qlearning_learn(params):
+    environment, agent_module = load_modules('MDP', 'environment', 'agent')
+    env = environment.GridWorld(size=params['grid_size'])
+    # 무작위 행동으로 미리 모은 전이에 대해 learn만 측정
+    transitions = []
+    state = env.reset()
+    for action in np.random.default_rng(0).integers(4, size=params['learn_steps']).tolist():
+        next_state, reward, done = env.step(action)
+        transitions.append((state, action, reward, next_state, done))
+        state = env.reset() if done else next_state
+    agent = agent_module.QLearningAgent(env, seed=0)
+
+    def run():
+        agent.q_table[:] = 0
+        for transition in transitions:
+            agent.learn(*transition)
+    return run, len(transitions), 'updates'
+
+def bench_train_agent(params):
+    environment, train = load_modules('MDP', 'environment', 'train')
+
+    def run():
+        train.train_agent(num_episodes=params['train_episodes'], env=environment.GridWorld(size=params['grid_size']),
+                          seed=0, verbose=False)
+    return run, params['train_episodes'], 'episodes'
+
+def bench_jump_game_step(params):
+    jump_game_env, = load_modules('MC', 'jump_game_env')
+    env = jump_game_env.JumpGameEnv(board_size=params['board_size'])
+    actions = np.random.default_rng(0).integers(2, size=params['jump_steps']).tolist()
+
+    def run():
+        env.reset()
+        for action in actions:
+            if env.step(action)[2]:
+                env.reset()
+    return run, len(actions), 'steps'
+
+def bench_mc_predict(params):
+    jump_game_env, policies, monte_carlo_prediction = load_modules(
+        'MC', 'jump_game_env', 'policies', 'monte_carlo_prediction')
+    env = jump_game_env.JumpGameEnv(board_size=params['board_size'])
+    policy = policies.RandomPolicy(env)
+    predictor = monte_carlo_prediction.MonteCarloPredictor(env)
+
+    def run():
+        np.random.seed(0)
+        predictor.predict(params['mc_episodes'], policy)
+    return run, params['mc_episodes'], 'episodes'
+
+def bench_policy_select_action(params):
+    reinforce, = load_modules('REINFORCE', 'reinforce')
+    import torch
+    torch.manual_seed(0)
+    policy = reinforce.PolicyNetwork(4, 2)
+    states = np.random.default_rng(0).uniform(-0.05, 0.05, size=(params['policy_actions'], 4)).astype(np.float32)
+
+    def run():
+        for state in states:
+            policy.select_action(state)
+    return run, len(states), 'actions'
+
+def bench_reinforce_update(params):
+    reinforce, = load_modules('REINFORCE', 'reinforce')
+    import torch
+    torch.manual_seed(0)
+    policy = reinforce.PolicyNetwork(4, 2)
+    optimizer = torch.optim.Adam(policy.parameters(), lr=0.01)
+    # 고정된 에피소드 하나로 train_reinforce가 에피소드마다 호출하는 reinforce_update를 측정
+    rng = np.random.default_rng(0)
+    length = params['episode_length']
+    states = torch.as_tensor(rng.uniform(-0.05, 0.05, size=(length, 4)), dtype=torch.float32)
+    actions = torch.as_tensor(rng.integers(2, size=length))
+    rewards = np.ones(length)
+
+    def run():
+        for _ in range(params['update_episodes']):
+            reinforce.reinforce_update(policy, optimizer, states, actions, rewards, 0.99)
+    return run, params['update_episodes'], 'updates'
+
+BENCHMARKS = {
+    'gridworld_step': bench_gridworld_step,
+    'qlearning_learn': bench_qlearning_learn,
+    'train_agent': bench_train_agent,
+    'jump_game_step': bench_jump_game_step,
+    'mc_predict': bench_mc_predict,
+    'policy_select_action': bench_policy_select_action,
+    'reinforce_update': bench_reinforce_update,
+}
+
+def calibrate(run, min_time=0.2):
+    """한 번 예열하면서, 측정 한 번이 min_time초 이상이 되도록 run을 묶어 실행할 횟수 계산"""
+    start = time.perf_counter()
+    run()
+    return max(1, int(np.ceil(min_time / max(time.perf_counter() - start, 1e-9))))
+
+def time_loops(run, loops):
+    """run을 loops번 실행해 한 번당 시간 반환"""
+    start = time.perf_counter()
+    for _ in range(loops):
+        run()
+    return (time.perf_counter() - start) / loops
+
+def get_metadata(size, repeats, min_time):
+    """결과 해석에 필요한 머신/소프트웨어 정보"""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=REPO_ROOT, capture_output=True,
+                                text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    try:
+        import torch
+        torch_version, torch_threads = torch.__version__, torch.get_num_threads()
+    except ImportError:
+        torch_version, torch_threads = None, None
+    return {
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'size': size,
+        'params': SIZES[size],
+        'repeats': repeats,
+        'min_time': min_time,
+        'git_commit': commit,
+        'hostname': platform.node(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'processor': platform.processor(),
+        'cpu_count': os.cpu_count(),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'torch': torch_version,
+        'torch_threads': torch_threads,
+    }
+
+def run_benchmarks(size='small', repeats=5, names=None, verbose=True, min_time=0.2):
+    """
+    벤치마크 실행
+    반환값: {'metadata': ..., 'results': {이름: 결과}}
+    결과는 run 한 번당 시간 목록과 가장 빠른 시간 기준 처리량 (잡음은 시간을 늘리기만 하므로),
+    의존성이 없어 건너뛴 경우에는 skipped 사유
+    """
+    params = SIZES[size]
+    results = {}
+    runs = {}
+    for name in names or BENCHMARKS:
+        try:
+            run, work, unit = BENCHMARKS[name](params)
+        except ImportError as e:
+            results[name] = {'skipped': str(e)}
+            if verbose:
+                print(f"{name:>22}: 건너뜀 ({e})")
+            continue
+        runs[name] = (run, calibrate(run, min_time))
+        results[name] = {'unit': unit, 'work': work, 'loops': runs[name][1], 'seconds': []}
+
+    # 벤치마크를 번갈아 가며 repeats바퀴 측정 (머신이 잠시 느려지는 구간이 한 벤치마크에만 몰리지 않도록)
+    for _ in range(repeats):
+        for name, (run, loops) in runs.items():
+            results[name]['seconds'].append(time_loops(run, loops))
+
+    for name in runs:
+        result = results[name]
+        times = result['seconds']
+        result.update(best_seconds=min(times), median_seconds=float(np.median(times)),
+                      throughput=result['work'] / min(times))
+        if verbose:
+            print(f"{name:>22}: {result['throughput']:>14,.1f} {result['unit']}/초 "
+                  f"(최소 {min(times):.4f}초, 중앙값 {np.median(times):.4f}초, {result['loops']}번씩 묶어 {repeats}회)")
+    return {'metadata': get_metadata(size, repeats, min_time), 'results': results}
+
+def measurement_noise(result):
+    """반복 측정의 상대 잡음 (중앙값 / 최소 - 1, 시간 목록이 하나뿐인 이전 형식 결과는 0)"""
+    times = result.get('seconds', [])
+    return float(np.median(times) / min(times) - 1) if len(times) > 1 else 0.0
+
+def compare_to_baseline(report, baseline, tolerance=0.2):
+    """
+    기준 결과와 처리량(가장 빠른 측정 기준) 비교
+    허용 감소 비율은 두 결과 각각의 측정 잡음(중앙값 / 최소 - 1)만큼 넓혀서 적용한다
+    (반복 측정끼리도 그만큼 차이 나는 머신에서는 그보다 작은 차이를 회귀로 판단할 수 없으므로).
+    반환값: 회귀한 벤치마크 이름 목록 (처리량 < 기준 * (1 - 넓힌 허용 비율))
+    크기 설정이 다르면 비교할 수 없으므로 ValueError
+    """
+    if report['metadata']['params'] != baseline['metadata']['params']:
+        raise ValueError(f"기준 결과의 크기 설정({baseline['metadata']['size']})이 현재와 다릅니다.")
+    for key in ('hostname', 'cpu_count', 'machine', 'min_time'):
+        if report['metadata'].get(key) != baseline['metadata'].get(key):
+            print(f"경고: 기준 결과와 {key}가 다릅니다 ({baseline['metadata'].get(key)} -> {report['metadata'].get(key)})")
+
+    regressions = []
+    for name, result in report['results'].items():
+        base = baseline['results'].get(name)
+        if 'throughput' not in result or base is None or 'throughput' not in base:
+            continue
+        ratio = result['throughput'] / base['throughput']
+        allowed = tolerance + measurement_noise(result) + measurement_noise(base)
+        regressed = ratio < 1 - allowed
+        if regressed:
+            regressions.append(name)
+        print(f"{name:>22}: 기준 대비 {ratio:.2f}배 (허용 감소 {allowed:.0%}){' (회귀)' if regressed else ''}")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="MDP/MC/REINFORCE 핫 패스 벤치마크")
+    parser.add_argument('--size', choices=list(SIZES), default='small')
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--min-time', type=float, default=0.2, help="측정 한 번의 최소 시간 (초)")
+    parser.add_argument('--only', nargs='+', choices=list(BENCHMARKS), default=None, help="실행할 벤치마크")
+    parser.add_argument('--output', default=None, help="결과 JSON 파일 (다음 실행의 --baseline으로 사용 가능)")
+    parser.add_argument('--baseline', default=None, help="비교할 기준 JSON 파일")
+    parser.add_argument('--tolerance', type=float, default=0.2, help="허용하는 처리량 감소 비율")
+    args = parser.parse_args()
+
+    print(f"=== 벤치마크 (크기 {args.size}, 반복 {args.repeats}회) ===")
+    report = run_benchmarks(args.size, args.repeats, args.only, min_time=args.min_time)
+    if args.output is not None:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"결과 저장: {args.output}")
+
+    if args.baseline is not None:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        print(f"=== 기준 결과와 비교 (허용 감소 {args.tolerance:.0%}) ===")
+        regressions = compare_to_baseline(report, baseline, args.tolerance)
+        if regressions:
+            print(f"처리량 회귀: {', '.join(regressions)}")
+            sys.exit(1)
+        print("회귀 없음")
+
+if __name__ == "__main__":
+    main()